@@ -1,23 +1,167 @@
 # pos_app/api/auth.py
 
+import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
 import frappe
 import jwt
 from frappe import _
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 
-def validate_auth():
-    auth = frappe.get_request_header("Authorization")
+# Verified tokens are kept per worker for at most TOKEN_CACHE_TTL seconds (or
+# until `exp`), which bounds how long a logout in another worker goes unseen.
+TOKEN_CACHE_SIZE = 2048
+TOKEN_CACHE_TTL = 60
+
+REVOKED_TOKEN_KEY = "pos_app:revoked_jwt:{0}"
+REVOCATIONS_LOADED_KEY = "pos_app:revoked_jwt_loaded"
+
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+def get_token_hash(token):
+    return hashlib.sha1(token.encode()).hexdigest()
 
+def get_cached_payload(token_hash):
+    key = (frappe.local.site, token_hash)
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if not entry:
+            return None
+        payload, expires_at = entry
+        if expires_at <= time.time():
+            del _token_cache[key]
+            return None
+        _token_cache.move_to_end(key)
+        return payload
+
+def cache_payload(token_hash, payload):
+    ttl = frappe.conf.get("jwt_cache_ttl", TOKEN_CACHE_TTL)
+    expires_at = min(payload.get("exp") or float("inf"), time.time() + ttl)
+    with _token_cache_lock:
+        _token_cache[(frappe.local.site, token_hash)] = (payload, expires_at)
+        _token_cache.move_to_end((frappe.local.site, token_hash))
+        while len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+
+def evict_token(token_hash):
+    with _token_cache_lock:
+        _token_cache.pop((frappe.local.site, token_hash), None)
+
+def get_bearer_token():
+    auth = frappe.get_request_header("Authorization")
     if auth and auth.startswith("Bearer "):
-        token = auth.split(" ")[1]
-        try:
-            payload = jwt.decode(token, frappe.conf.get("jwt_secret"), algorithms=["HS256"])
-            frappe.set_user(payload["sub"])
-            return
-        except ExpiredSignatureError:
-            frappe.throw(_("Token has expired"), frappe.AuthenticationError)
-        except InvalidTokenError:
-            frappe.throw(_("Invalid token"), frappe.AuthenticationError)
+        return auth.split(" ")[1]
+
+def revoke_token(token_hash, exp):
+    """
+    Revoke a token until its `exp`: a Redis key that expires with the token,
+    backed by the `blacklisted_jwt_token` table.
+    """
+    remaining = int(exp - time.time()) + 1
+    if remaining <= 0:
+        return
+
+    frappe.db.sql("""
+        INSERT IGNORE INTO `blacklisted_jwt_token` (name, expires_at)
+        VALUES (%s, %s)
+    """, (token_hash, datetime.datetime.utcfromtimestamp(exp)))
+    frappe.cache().set_value(REVOKED_TOKEN_KEY.format(token_hash), 1, expires_in_sec=remaining)
+    evict_token(token_hash)
+
+def load_revocations():
+    """Copy unexpired revocations from the table into Redis, e.g. after a flush."""
+    now = datetime.datetime.utcnow()
+    rows = frappe.db.sql("""
+        SELECT name, expires_at FROM `blacklisted_jwt_token` WHERE expires_at > %s
+    """, (now,), as_dict=True)
+    for row in rows:
+        remaining = int((row.expires_at - now).total_seconds()) + 1
+        frappe.cache().set_value(REVOKED_TOKEN_KEY.format(row.name), 1, expires_in_sec=remaining)
+    frappe.cache().set_value(REVOCATIONS_LOADED_KEY, 1)
+
+def is_token_revoked(token_hash):
+    if not frappe.cache().get_value(REVOCATIONS_LOADED_KEY):
+        load_revocations()
+    return bool(frappe.cache().get_value(REVOKED_TOKEN_KEY.format(token_hash)))
+
+def purge_expired_revocations():
+    """Scheduled job: drop revocations whose tokens have expired anyway."""
+    frappe.db.sql("""
+        DELETE FROM `blacklisted_jwt_token` WHERE expires_at < %s
+    """, (datetime.datetime.utcnow(),))
+    frappe.db.commit()
+
+def verify_token(token):
+    token_hash = get_token_hash(token)
+    payload = get_cached_payload(token_hash)
+    if payload:
+        return {
+            "status": "success",
+            "payload": payload
+        }
+
+    if is_token_revoked(token_hash):
+        return {
+            "status": "error",
+            "code": 401,
+            "message": "Token is revoked"
+        }
+
+    try:
+        payload = jwt.decode(token, frappe.conf.get("jwt_secret"), algorithms=["HS256"])
+    except ExpiredSignatureError:
+        return {
+            "status": "error",
+            "code": 401,
+            "message": "Token has expired"
+        }
+    except InvalidTokenError:
+        return {
+            "status": "error",
+            "code": 401,
+            "message": "Invalid token"
+        }
+
+    cache_payload(token_hash, payload)
+    return {
+        "status": "success",
+        "payload": payload
+    }
+
+def get_auth_context():
+    """
+    Result of verifying the request's bearer token, computed once per request
+    and stored on `frappe.local.pos_auth`.
+    """
+    if getattr(frappe.local, "pos_auth", None) is None:
+        token = get_bearer_token()
+        if token:
+            frappe.local.pos_auth = verify_token(token)
+        else:
+            frappe.local.pos_auth = {
+                "status": "error",
+                "code": 401,
+                "message": "Missing or invalid Authorization header"
+            }
+    return frappe.local.pos_auth
+
+def validate_auth():
+    if not get_bearer_token():
+        return
+
+    result = get_auth_context()
+    if result["status"] == "success":
+        frappe.set_user(result["payload"]["sub"])
+        return
+
+    if result["message"] == "Token has expired":
+        frappe.throw(_("Token has expired"), frappe.AuthenticationError)
+    elif result["message"] == "Invalid token":
+        frappe.throw(_("Invalid token"), frappe.AuthenticationError)
 
     # If token missing or invalid
     # raise frappe.AuthenticationError(_("Missing or invalid token"))
@@ -0,0 +1,124 @@
+import json
+
+import frappe
+from pos_app.apis.item import get_catalog_scope
+from pos_app.apis.login import verify_jwt_token
+from pos_app.apis.price_index import BUILT_FIELD, get_item_price
+
+# Redis hash of barcode -> JSON entry with the item, its UOM and conversion factor
+BARCODE_INDEX_KEY = "pos_app:barcodes"
+
+def get_barcode_rows(item_codes=None):
+    conditions = ""
+    values = {}
+    if item_codes:
+        conditions = "AND item.name IN %(item_codes)s"
+        values["item_codes"] = tuple(item_codes)
+
+    return frappe.db.sql(f"""
+        SELECT barcode.barcode, item.name AS item_code, item.item_name, item.item_group,
+            IFNULL(NULLIF(barcode.uom, ''), item.stock_uom) AS uom,
+            IFNULL(ucd.conversion_factor, 1) AS conversion_factor
+        FROM `tabItem Barcode` barcode
+        INNER JOIN `tabItem` item ON item.name = barcode.parent
+        LEFT JOIN `tabUOM Conversion Detail` ucd
+            ON ucd.parent = item.name AND ucd.parenttype = 'Item' AND ucd.uom = barcode.uom
+        WHERE barcode.parenttype = 'Item' AND item.disabled = 0 {conditions}
+    """, values, as_dict=True)
+
+def to_entry(row):
+    return json.dumps({
+        "item_code": row.item_code,
+        "item_name": row.item_name,
+        "item_group": row.item_group,
+        "uom": row.uom,
+        "conversion_factor": row.conversion_factor
+    })
+
+def build_barcode_index():
+    """Index every barcode of an enabled item in one query."""
+    cache = frappe.cache()
+    key = cache.make_key(BARCODE_INDEX_KEY)
+    mapping = {row.barcode: to_entry(row) for row in get_barcode_rows()}
+    pipe = cache.pipeline()
+    pipe.delete(key)
+    pipe.hset(key, mapping=dict(mapping, **{BUILT_FIELD: 1}))
+    pipe.execute()
+
+def get_barcode_entry(barcode):
+    """Indexed entry of a barcode, building the index on first use."""
+    cache = frappe.cache()
+    key = cache.make_key(BARCODE_INDEX_KEY)
+    pipe = cache.pipeline()
+    pipe.hget(key, barcode)
+    pipe.hexists(key, BUILT_FIELD)
+    entry, built = pipe.execute()
+    if not built:
+        build_barcode_index()
+        entry = cache.pipeline().hget(key, barcode).execute()[0]
+    return json.loads(entry) if entry else None
+
+def update_barcode_index(doc, method=None, *args):
+    """doc_events handler for Item: patch the item's barcodes once committed."""
+    before = doc.get_doc_before_save() if method == "on_update" else None
+    old_barcodes = {row.barcode for row in doc.barcodes}
+    if before:
+        old_barcodes.update(row.barcode for row in before.barcodes)
+    item_code = doc.name
+
+    def refresh():
+        cache = frappe.cache()
+        key = cache.make_key(BARCODE_INDEX_KEY)
+        if method == "after_rename":
+            # Entries carry the old item code; rebuild on the next scan
+            cache.pipeline().delete(key).execute()
+            return
+        if not cache.pipeline().hexists(key, BUILT_FIELD).execute()[0]:
+            return
+
+        rows = get_barcode_rows([item_code]) if method != "on_trash" else []
+        pipe = cache.pipeline()
+        for barcode in old_barcodes - {row.barcode for row in rows}:
+            pipe.hdel(key, barcode)
+        for row in rows:
+            pipe.hset(key, row.barcode, to_entry(row))
+        pipe.execute()
+
+    frappe.db.after_commit.add(refresh)
+
+@frappe.whitelist(allow_guest=True)
+def scan_barcode(barcode=None):
+    """
+    Item, UOM and price under the caller's price list for a scanned barcode.
+    The price is for the barcode's UOM.
+    """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
+
+    scope = get_catalog_scope(result["payload"]["sub"])
+    if scope is None:
+        return "users not applicable with this pos profile"
+
+    entry = get_barcode_entry(barcode) if barcode else None
+    if entry and scope.group_subtree is not None and entry["item_group"] not in scope.group_subtree:
+        entry = None
+    if not entry:
+        frappe.local.response["http_status_code"] = 404
+        return {
+            "status": "error",
+            "code": 404,
+            "message": "Barcode not found"
+        }
+
+    rate = get_item_price(scope.price_list, scope.customer, entry["item_code"])
+    return {
+        "status": "success",
+        "barcode": barcode,
+        "item_code": entry["item_code"],
+        "item_name": entry["item_name"],
+        "uom": entry["uom"],
+        "conversion_factor": entry["conversion_factor"],
+        "price": rate * entry["conversion_factor"] if rate is not None else None
+    }
@@ -0,0 +1,107 @@
+import re
+
+import frappe
+from frappe.utils import cint
+from pos_app.apis.login import verify_jwt_token
+from pos_app.apis.sales_invoice import get_history_owners
+
+MOBILE_SEARCH_LIMIT = 10
+MOBILE_SEARCH_MAX_LIMIT = 50
+MOBILE_RECENT_INVOICES = 3
+# Shorter prefixes match too much of the table to be useful for type-ahead
+MOBILE_MIN_PREFIX = 3
+
+def normalize_phone(value):
+    """Digits only, so '+968 9123-4567' and '96891234567' match."""
+    return re.sub(r"\D", "", value or "")
+
+def update_mobile_index(doc, method=None):
+    """doc_events handler for Sales Invoice on_submit / on_cancel."""
+    if method == "on_cancel":
+        frappe.db.sql("DELETE FROM `pos_mobile_invoice` WHERE invoice = %s", (doc.name,))
+        return
+
+    phone = normalize_phone(doc.get("mobile_no"))
+    if not phone:
+        return
+    frappe.db.sql("""
+        INSERT IGNORE INTO `pos_mobile_invoice` (phone, posting_date, invoice, customer, owner, grand_total)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (phone, doc.posting_date, doc.name, doc.customer, doc.owner, doc.grand_total))
+
+def backfill_mobile_index():
+    """
+    Index the mobile numbers of submitted invoices created before the index.
+    Run with `bench --site <site> execute pos_app.apis.customer.backfill_mobile_index`.
+    """
+    frappe.db.sql("""
+        INSERT IGNORE INTO `pos_mobile_invoice` (phone, posting_date, invoice, customer, owner, grand_total)
+        SELECT REGEXP_REPLACE(mobile_no, '[^0-9]', ''), posting_date, name, customer, owner, grand_total
+        FROM `tabSales Invoice`
+        WHERE docstatus = 1 AND REGEXP_REPLACE(IFNULL(mobile_no, ''), '[^0-9]', '') != ''
+    """)
+    frappe.db.commit()
+
+@frappe.whitelist(allow_guest=True)
+def search_customers_by_mobile(mobile_no=None, limit=None):
+    """
+    Type-ahead lookup of returning customers by the start of their mobile
+    number, with each number's last few invoices.
+    """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
+
+    prefix = normalize_phone(mobile_no)
+    if len(prefix) < MOBILE_MIN_PREFIX:
+        frappe.local.response["http_status_code"] = 400
+        return {
+            "status": "error",
+            "code": 400,
+            "message": f"mobile_no needs at least {MOBILE_MIN_PREFIX} digits"
+        }
+
+    values = {
+        "prefix": prefix + "%",
+        "owners": tuple(get_history_owners(result["payload"]["sub"])),
+        "limit": max(1, min(cint(limit) or MOBILE_SEARCH_LIMIT, MOBILE_SEARCH_MAX_LIMIT)),
+        "recent": MOBILE_RECENT_INVOICES
+    }
+    # Matching numbers are bounded first, then only their latest invoices are ranked
+    rows = frappe.db.sql("""
+        SELECT phone, customer, invoice, posting_date, grand_total
+        FROM (
+            SELECT m.phone, m.customer, m.invoice, m.posting_date, m.grand_total,
+                ROW_NUMBER() OVER (PARTITION BY m.phone ORDER BY m.posting_date DESC, m.invoice DESC) AS rn
+            FROM (
+                SELECT DISTINCT phone FROM `pos_mobile_invoice`
+                WHERE phone LIKE %(prefix)s AND owner IN %(owners)s
+                ORDER BY phone
+                LIMIT %(limit)s
+            ) matches
+            INNER JOIN `pos_mobile_invoice` m ON m.phone = matches.phone
+            WHERE m.owner IN %(owners)s
+        ) ranked
+        WHERE rn <= %(recent)s
+        ORDER BY phone, rn
+    """, values, as_dict=True)
+
+    customers = {}
+    for row in rows:
+        entry = customers.setdefault(row.phone, {
+            "mobile_no": row.phone,
+            "customer": row.customer,
+            "invoices": []
+        })
+        entry["invoices"].append({
+            "name": row.invoice,
+            "customer": row.customer,
+            "posting_date": row.posting_date,
+            "grand_total": row.grand_total
+        })
+
+    return {
+        "success_key": 1,
+        "customers": list(customers.values())
+    }
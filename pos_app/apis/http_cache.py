@@ -0,0 +1,40 @@
+import hashlib
+from zoneinfo import ZoneInfo
+
+import frappe
+from frappe.utils import get_datetime, get_system_timezone
+from werkzeug.wrappers import Response
+
+def get_versioned(key, field, build):
+    """
+    Cached representation of a rarely changing resource with its ETag and
+    Last-Modified. `build` returns (data, modified) and only runs after the
+    resource's doc_events cleared the entry.
+    """
+    entry = frappe.cache().hget(key, field)
+    if entry is None:
+        data, modified = build()
+        content = frappe.as_json(data, indent=None).encode()
+        entry = {
+            "etag": hashlib.sha1(content).hexdigest()[:16],
+            "modified": str(get_datetime(modified)) if modified else None,
+            "data": data
+        }
+        frappe.cache().hset(key, field, entry)
+    return entry
+
+def make_conditional_response(entry):
+    """JSON response shaped like a whitelisted method's, or a 304 if the client has it."""
+    response = Response(frappe.as_json({"message": entry["data"]}, indent=None),
+        content_type="application/json")
+    response.set_etag(entry["etag"])
+    if entry["modified"]:
+        modified = get_datetime(entry["modified"]).replace(tzinfo=ZoneInfo(get_system_timezone()))
+        response.last_modified = modified
+    # Clients may keep it, but must revalidate before each use
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(frappe.request)
+
+def clear_versioned(key):
+    frappe.cache().delete_value(key)
+    frappe.db.after_commit.add(lambda: frappe.cache().delete_value(key))
@@ -1,16 +1,21 @@
+import gzip
+import json
 import frappe
 from frappe import _
+from frappe.utils import add_days, add_to_date, cint, get_datetime, getdate, now, nowdate
 from pos_app.apis.login import verify_jwt_token
+from pos_app.apis.pos_profile import get_profile_context
+from pos_app.apis.price_index import get_price_index
+from pos_app.apis.thumbnail import get_thumbnail_urls
+from werkzeug.wrappers import Response
 
-def get_items_from_warhouse(warehouse):
-    items = frappe.get_all("Bin",
-        filters={
-            "warehouse": warehouse,
-            "actual_qty": [">", 0]
-        },
-        fields=["item_code"]
-    )
-    return [item.item_code for item in items]
+CATALOG_CACHE_KEY = "pos_app:catalog"
+CATALOG_SCOPE_CACHE_KEY = "pos_app:catalog_scope"
+COMPACT_MEDIA_TYPE = "application/vnd.pos-app.compact+json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+# Cursors are moved back this far: a slow save can commit after a cursor was
+# handed out while carrying an earlier `modified`
+CURSOR_OVERLAP_MINUTES = 5
 
 def has_user_permission(usr, allow):
     if frappe.db.exists("User Permission", {"user": usr, "allow": allow}):
@@ -18,66 +23,321 @@ def has_user_permission(usr, allow):
         return [v["for_value"] for v in values]
     return []
 
-@frappe.whitelist(allow_guest=True)
-def get_pos_items():
-    # Verify token first
-    result = verify_jwt_token()
+def get_catalog_scope(usr):
+    """
+    Resolve the price list and Item Groups that apply to the user, cached per
+    user. Groups include their whole subtree; None means every group.
+    Returns None when the user is not applicable with their POS profile.
+    """
+    scope = frappe.cache().hget(CATALOG_SCOPE_CACHE_KEY, usr)
+    if scope is None:
+        scope = build_catalog_scope(usr) or {}
+        frappe.cache().hset(CATALOG_SCOPE_CACHE_KEY, usr, scope)
+    return frappe._dict(scope) if scope else None
 
-    if result["status"] == "error":
-        frappe.local.response["http_status_code"] = result["code"]
-        return result
-
-    payload = result["payload"]
+def build_catalog_scope(usr):
     price_list = None
-    item_filters = {"disabled": 0}
-    usr = payload["sub"]
-    pos_profile = frappe.db.get_value("POS Profile User",{"user":usr},"parent")
-    if pos_profile:
-        profile = frappe.get_doc("POS Profile", pos_profile)
+    item_groups = None
+    profile = get_profile_context(usr)
+    if profile:
         price_list = profile.selling_price_list
-        applicable_for_users = [row.user for row in profile.applicable_for_users]
-        if usr not in applicable_for_users:
-            return "users not applicable with this pos profile"
-
-        item_groups = [row.item_group for row in profile.item_groups]
-        if item_groups:
-            item_filters["item_group"] = ["in", item_groups]
+        if usr not in profile.applicable_for_users:
+            return None
 
-        # Optional warehouse filter:
-        # if profile.warehouse:
-        #     items_names = get_items_from_warhouse(profile.warehouse)
-        #     item_filters["name"] = ["in", items_names]
+        if profile.item_groups:
+            item_groups = profile.item_groups
 
     user_item_groups = has_user_permission(usr=usr, allow="Item Group")
     if user_item_groups:
-        item_filters["item_group"] = ["in", user_item_groups]
+        item_groups = user_item_groups
 
-    items = frappe.get_all("Item",
-        filters=item_filters,
-        fields=["name", "item_name", "image"]
+    return dict(
+        price_list=price_list,
+        item_groups=sorted(item_groups) if item_groups else None,
+        group_subtree=sorted(get_group_subtree(item_groups)) if item_groups else None,
+        customer=profile.customer if profile else None,
+        warehouse=profile.warehouse if profile else None,
+        hide_unavailable_items=profile.hide_unavailable_items if profile else 0
     )
 
-    item_names = [item["name"] for item in items]
+def get_catalog_items(scope, with_stock=False):
+    """
+    Enabled items in the scope. Item Groups are matched on their lft/rgt range,
+    so naming a parent group brings in every item below it.
+    With `with_stock`, Bin is joined on the profile warehouse to add each item's qty.
+    """
+    fields = ["item.name", "item.item_name", "item.image"]
+    joins = []
+    conditions = ["item.disabled = 0"]
+    values = {}
 
-    prices = frappe.get_all("Item Price",
-        filters={
-            "price_list": price_list,
-            "item_code": ["in", item_names]
-        },
-        fields=["item_code", "price_list_rate"]
-    )
+    if scope.item_groups:
+        source = """`tabItem Group` root
+            INNER JOIN `tabItem Group` grp ON grp.lft >= root.lft AND grp.rgt <= root.rgt
+            INNER JOIN `tabItem` item ON item.item_group = grp.name"""
+        conditions.append("root.name IN %(item_groups)s")
+        values["item_groups"] = tuple(scope.item_groups)
+    else:
+        source = "`tabItem` item"
+
+    if with_stock:
+        fields.append("IFNULL(bin.actual_qty, 0) AS qty")
+        joins.append("LEFT JOIN `tabBin` bin ON bin.item_code = item.name AND bin.warehouse = %(warehouse)s")
+        values["warehouse"] = scope.warehouse
+        if scope.hide_unavailable_items:
+            conditions.append("bin.actual_qty > 0")
+
+    select_clause = ", ".join(fields)
+    join_clause = " ".join(joins)
+    where_clause = " AND ".join(conditions)
+    return frappe.db.sql(f"""
+        SELECT DISTINCT {select_clause}
+        FROM {source}
+        {join_clause}
+        WHERE {where_clause}
+    """, values, as_dict=True)
 
-    price_map = {p.item_code: p.price_list_rate for p in prices}
+def get_group_subtree(item_groups):
+    """All Item Groups at or below the given groups."""
+    return {g.name for g in frappe.db.sql("""
+        SELECT DISTINCT grp.name
+        FROM `tabItem Group` root
+        INNER JOIN `tabItem Group` grp ON grp.lft >= root.lft AND grp.rgt <= root.rgt
+        WHERE root.name IN %(item_groups)s
+    """, {"item_groups": tuple(item_groups)}, as_dict=True)}
 
+def get_price_map(scope, item_codes):
+    """Effective prices for the scope's price list and customer, from the price index."""
+    if not item_codes:
+        return {}
+    return get_price_index(scope.price_list, scope.customer)
+
+def build_catalog(items, price_map):
     result = []
     site_url = frappe.utils.get_url()
+    thumbnails = get_thumbnail_urls([item.image for item in items])
     for item in items:
         image_url = site_url + item.image if item.image else None
+        thumbnail_url = site_url + thumbnails[item.image] if item.image in thumbnails else None
         result.append({
             "item_code":item.name,
             "item_name": item.item_name,
             "image": image_url,
+            "thumbnail": thumbnail_url,
             "price": price_map.get(item.name, 0.0)
         })
+        if "qty" in item:
+            result[-1]["qty"] = item.qty
+    return result
+
+def get_full_catalog(scope):
+    """
+    Built catalog for the scope, cached per (price list, customer, item groups, day) key.
+    """
+    # Prices depend on the day through valid_from / valid_upto
+    cache_key = frappe.as_json([scope.price_list, scope.customer, scope.item_groups, nowdate()], indent=None)
+    catalog = frappe.cache().hget(CATALOG_CACHE_KEY, cache_key)
+    if catalog is not None:
+        return catalog
+
+    items = get_catalog_items(scope)
+    price_map = get_price_map(scope, [item["name"] for item in items])
+    catalog = build_catalog(items, price_map)
+    frappe.cache().hset(CATALOG_CACHE_KEY, cache_key, catalog)
+    return catalog
+
+def get_stock_catalog(scope):
+    """
+    Catalog with qty from the profile warehouse. Stock moves too often to cache.
+    """
+    items = get_catalog_items(scope, with_stock=True)
+    price_map = get_price_map(scope, [item["name"] for item in items])
+    return build_catalog(items, price_map)
+
+def clear_catalog_scope(doc=None, method=None, *args):
+    """doc_events handler for POS Profile, Item Group and User Permission."""
+    frappe.cache().delete_value(CATALOG_SCOPE_CACHE_KEY)
+    frappe.db.after_commit.add(lambda: frappe.cache().delete_value(CATALOG_SCOPE_CACHE_KEY))
+
+def clear_catalog_cache(doc=None, method=None, *args):
+    """doc_events handler for Item, Item Price, Item Group and POS Profile."""
+    frappe.cache().delete_value(CATALOG_CACHE_KEY)
+    # Drop again once committed so a concurrent read can't re-cache stale rows
+    frappe.db.after_commit.add(lambda: frappe.cache().delete_value(CATALOG_CACHE_KEY))
+
+def is_in_scope(item, group_subtree):
+    if item.disabled:
+        return False
+    return group_subtree is None or item.item_group in group_subtree
+
+def get_catalog_changes(scope, since):
+    """
+    Items and prices added, changed, disabled or deleted after `since`.
+    Items that fell out of the profile scope are reported as removed.
+    """
+    fields = ["name", "item_name", "image", "item_group", "disabled"]
+    changed = {item.name: item for item in frappe.get_all("Item",
+        filters={"modified": [">", since]},
+        fields=fields
+    )}
+
+    price_codes = {p.item_code for p in frappe.get_all("Item Price",
+        filters={
+            "price_list": scope.price_list,
+            "modified": [">", since]
+        },
+        fields=["item_code"]
+    )}
+
+    # Prices whose validity window opened or closed since the last sync
+    since_date, today = getdate(since), getdate(nowdate())
+    if since_date < today:
+        price_codes.update(p.item_code for p in frappe.get_all("Item Price",
+            filters={"price_list": scope.price_list},
+            or_filters=[
+                ["valid_from", "between", [add_days(since_date, 1), today]],
+                ["valid_upto", "between", [since_date, add_days(today, -1)]]
+            ],
+            fields=["item_code"]
+        ))
+
+    removed = set()
+    deleted_docs = frappe.get_all("Deleted Document",
+        filters={
+            "deleted_doctype": ["in", ["Item", "Item Price"]],
+            "creation": [">", since]
+        },
+        fields=["deleted_doctype", "deleted_name", "data"]
+    )
+    for deleted in deleted_docs:
+        if deleted.deleted_doctype == "Item":
+            removed.add(deleted.deleted_name)
+            continue
+        data = json.loads(deleted.data or "{}")
+        if data.get("price_list") == scope.price_list and data.get("item_code"):
+            price_codes.add(data["item_code"])
+
+    missing = list(price_codes - set(changed) - removed)
+    if missing:
+        for item in frappe.get_all("Item", filters={"name": ["in", missing]}, fields=fields):
+            changed[item.name] = item
+
+    group_subtree = set(scope.group_subtree) if scope.group_subtree is not None else None
+    items = []
+    for item in changed.values():
+        if is_in_scope(item, group_subtree):
+            items.append(item)
+        else:
+            removed.add(item.name)
+
+    return items, sorted(removed)
+
+def wants_compact(compact=None):
+    accept = frappe.get_request_header("Accept") or ""
+    return bool(cint(compact) or COMPACT_MEDIA_TYPE in accept or MSGPACK_MEDIA_TYPE in accept)
+
+def to_columns(catalog):
+    """
+    Catalog rows as parallel column arrays, with image URLs relative to base_url.
+    """
+    site_url = frappe.utils.get_url()
+    keys = list(catalog[0]) if catalog else ["item_code", "item_name", "image", "thumbnail", "price"]
+    columns = {key: [] for key in keys}
+    for row in catalog:
+        for key in keys:
+            value = row.get(key)
+            if key in ("image", "thumbnail") and value and value.startswith(site_url):
+                value = value[len(site_url):]
+            columns[key].append(value)
+
+    return {
+        "base_url": site_url,
+        "count": len(catalog),
+        "columns": columns
+    }
+
+def make_compact_response(data):
+    """
+    Encode as msgpack when asked for and available, otherwise JSON, and gzip
+    the body when the client accepts it.
+    """
+    accept = frappe.get_request_header("Accept") or ""
+    body = None
+    if MSGPACK_MEDIA_TYPE in accept:
+        try:
+            import msgpack
+            body = msgpack.packb(data, default=str)
+            content_type = MSGPACK_MEDIA_TYPE
+        except ImportError:
+            pass
+    if body is None:
+        body = frappe.as_json(data, indent=None).encode()
+        content_type = "application/json"
+
+    response = Response(content_type=content_type)
+    if "gzip" in (frappe.get_request_header("Accept-Encoding") or ""):
+        body = gzip.compress(body, compresslevel=6)
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept, Accept-Encoding"
+    response.set_data(body)
+    return response
+
+@frappe.whitelist(allow_guest=True)
+def get_pos_items(cursor=None, with_stock=None, compact=None):
+    """
+    Return the POS catalog for the authenticated user.
+    When `cursor` is passed (empty for the first sync) the response carries only
+    the items changed since that cursor, the removed item codes and a new cursor.
+    Consecutive responses overlap by CURSOR_OVERLAP_MINUTES, so clients must
+    treat items and removals as idempotent upserts / deletes.
+    `with_stock` adds the qty in the profile warehouse to full catalog responses.
+    `compact` (or a compact Accept header) returns the items as column arrays.
+    """
+    # Verify token first
+    result = verify_jwt_token()
+
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
+
+    payload = result["payload"]
+    usr = payload["sub"]
+    scope = get_catalog_scope(usr)
+    if scope is None:
+        return "users not applicable with this pos profile"
+
+    with_stock = cint(with_stock) and scope.warehouse
+    compact = wants_compact(compact)
+
+    if cursor is None:
+        catalog = get_stock_catalog(scope) if with_stock else get_full_catalog(scope)
+        return make_compact_response(to_columns(catalog)) if compact else catalog
+
+    # Taken before reading and moved back by the overlap, so rows committed late
+    # show up next time; items sent twice are upserts on the client
+    new_cursor = add_to_date(now(), minutes=-CURSOR_OVERLAP_MINUTES, as_string=True, as_datetime=True)
+    if cursor:
+        try:
+            since = get_datetime(cursor)
+        except Exception:
+            frappe.local.response["http_status_code"] = 400
+            return {
+                "status": "error",
+                "code": 400,
+                "message": "Invalid cursor"
+            }
+        items, removed = get_catalog_changes(scope, since)
+        price_map = get_price_map(scope, [item["name"] for item in items])
+        catalog = build_catalog(items, price_map)
+    else:
+        catalog = get_stock_catalog(scope) if with_stock else get_full_catalog(scope)
+        removed = []
 
-    return result
\ No newline at end of file
+    response = {
+        "status": "success",
+        "full": not cursor,
+        "cursor": new_cursor,
+        "items": to_columns(catalog) if compact else catalog,
+        "removed": removed
+    }
+    return make_compact_response(response) if compact else response
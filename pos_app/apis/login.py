@@ -2,8 +2,10 @@ import frappe
 import jwt
 import datetime
 from frappe import _
-import hashlib
-from frappe.auth import LoginManager
+from frappe.auth import LoginManager, validate_ip_address
+from pos_app.apis.auth import get_auth_context, get_bearer_token, get_token_hash, revoke_token
+from pos_app.apis.pos_profile import build_receipt_header, get_profile_context
+from pos_app.apis.thumbnail import get_thumbnail_url
 
 SECRET_KEY = frappe.conf.get("jwt_secret")
 
@@ -11,13 +13,29 @@ def normalize_url(url):
     import re
     return re.sub(r'^https?:\/\/(www\.)?', '', url).rstrip('/')
 
+def get_login_user(user_id):
+    """Only the User fields the login response needs."""
+    user = frappe.db.get_value("User", user_id, ["name", "email", "full_name", "user_image"], as_dict=True)
+    roles = frappe.get_all("Has Role",
+        filters={"parent": user_id, "parenttype": "User"},
+        pluck="role"
+    )
+    return user, roles
+
 @frappe.whitelist(allow_guest=True)
-def login_pos_user(site_url=None, usr=None, pswd=None):
+def login_pos_user(site_url=None, usr=None, pswd=None, lean=None):
+    """
+    Authenticate a POS user and return a JWT with the user and profile details.
+    With `lean`, no Frappe session is created and only the needed fields are read;
+    the client is expected to authenticate with the token from then on. IP and
+    login hour restrictions and on_login hooks still apply.
+    """
     import json
     customer = None
     site_url = site_url or frappe.form_dict.get("site_url")
     usr = usr or frappe.form_dict.get("usr")
     pswd = pswd or frappe.form_dict.get("pswd")
+    lean = lean or frappe.form_dict.get("lean")
 
     if not site_url or not usr or not pswd:
         try:
@@ -26,6 +44,7 @@ def login_pos_user(site_url=None, usr=None, pswd=None):
                 site_url = site_url or body.get("site_url")
                 usr = usr or body.get("usr")
                 pswd = pswd or body.get("pswd")
+                lean = lean or body.get("lean")
         except Exception as e:
             return {
                 "status": "error",
@@ -47,35 +66,23 @@ def login_pos_user(site_url=None, usr=None, pswd=None):
 
         login_manager = LoginManager()
         login_manager.authenticate(user=usr, pwd=pswd)
-        login_manager.post_login()
-
-        user = frappe.get_doc("User", frappe.session.user)
-        pos_profile = frappe.db.get_value("POS Profile User",{"user":user.name},"parent")
-        # Prepare dict and add fields only if they are not None
+        if frappe.utils.cint(lean):
+            # post_login without the session: keep its login hooks, IP and hour checks
+            login_manager.run_trigger("on_login")
+            validate_ip_address(login_manager.user)
+            login_manager.validate_hour()
+            user, roles = get_login_user(login_manager.user)
+        else:
+            login_manager.post_login()
+            user = frappe.get_doc("User", frappe.session.user)
+            roles = [role.role for role in user.get("roles")]
+        profile = get_profile_context(user.name)
+        # Receipt header fields that are set, also served by welcome_page.get_receipt_header
         pos_profile_dict = {}
 
-        if pos_profile and frappe.db.exists("POS Profile", pos_profile):
-            profile = frappe.get_doc("POS Profile", pos_profile)
-            
-            
-            if profile.company_address:
-                pos_profile_dict["company_address"] = profile.company_address
-            
-            if profile.custom_logo:
-                pos_profile_dict["custom_logo"] = frappe.utils.get_url() + profile.custom_logo
-            
-            if profile.crno:
-                pos_profile_dict["crno"] = profile.crno
-            if profile.gsm:
-                pos_profile_dict["gsm"] = profile.gsm
-            if profile.p_o_box:
-                pos_profile_dict["p_o_box"] = profile.p_o_box
-            if profile.address:
-                pos_profile_dict["address"] = profile.address
-            if profile.terms:
-                pos_profile_dict["terms"] = profile.terms
-
-            
+        if profile:
+            pos_profile_dict = build_receipt_header(profile)
+
             if profile.customer:
                 customer= profile.customer
 
@@ -86,6 +93,7 @@ def login_pos_user(site_url=None, usr=None, pswd=None):
             "exp": datetime.datetime.utcnow() + datetime.timedelta(days=30)
         }
         token = jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+        thumbnail = get_thumbnail_url(user.user_image)
 
         return {
             "status": "success",
@@ -97,7 +105,8 @@ def login_pos_user(site_url=None, usr=None, pswd=None):
                 "full_name": user.full_name,
                 "email": user.email,
                 "user_image": frappe.utils.get_url() + user.user_image if user.user_image else None ,
-                "roles": [role.role for role in user.get("roles")]
+                "user_image_thumbnail": frappe.utils.get_url() + thumbnail if thumbnail else None,
+                "roles": roles
             }
         }
 
@@ -111,16 +120,9 @@ def login_pos_user(site_url=None, usr=None, pswd=None):
 @frappe.whitelist(allow_guest=True)
 def logout_pos_user():
     try:
-        auth_header = frappe.get_request_header("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-            
-            # Insert into blacklisted_jwt_token
-            name = hashlib.sha1(token.encode()).hexdigest()
-            frappe.db.sql("""
-                INSERT IGNORE INTO `blacklisted_jwt_token` (name, token)
-                VALUES (%s, %s)
-            """, (name, token))
+        result = get_auth_context()
+        if result["status"] == "success":
+            revoke_token(get_token_hash(get_bearer_token()), result["payload"]["exp"])
             frappe.db.commit()
 
         if hasattr(frappe.local, 'login_manager'):
@@ -139,44 +141,7 @@ def logout_pos_user():
         }
 
 def verify_jwt_token():
-    auth_header = frappe.get_request_header("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
-        return {
-            "status": "error",
-            "code": 401,
-            "message": "Missing or invalid Authorization header"
-        }
-
-    token = auth_header.split(" ")[1]
-    name = hashlib.sha1(token.encode()).hexdigest()
-
-    # Check blacklist
-    res = frappe.db.sql("""
-        SELECT name FROM `blacklisted_jwt_token` WHERE name = %s
-    """, (name,), as_dict=True)
-
-    if res:
-        return {
-            "status": "error",
-            "code": 401,
-            "message": "Token is revoked"
-        }
-
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        return {
-            "status": "success",
-            "payload": payload
-        }
-    except jwt.ExpiredSignatureError:
-        return {
-            "status": "error",
-            "code": 401,
-            "message": "Token has expired"
-        }
-    except jwt.InvalidTokenError:
-        return {
-            "status": "error",
-            "code": 401,
-            "message": "Invalid token"
-        }
+    """
+    Verified token payload for the current request, see `pos_app.apis.auth`.
+    """
+    return get_auth_context()
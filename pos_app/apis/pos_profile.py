@@ -0,0 +1,57 @@
+import frappe
+from pos_app.apis.http_cache import clear_versioned
+
+PROFILE_CACHE_KEY = "pos_app:profile_context"
+RECEIPT_HEADER_CACHE_KEY = "pos_app:receipt_headers"
+
+RECEIPT_HEADER_FIELDS = ["company_address", "custom_logo", "crno", "gsm", "p_o_box", "address", "terms"]
+
+def get_profile_context(usr):
+    """
+    The few POS Profile fields the APIs need for a user, cached per user.
+    Returns None when the user has no POS Profile.
+    """
+    context = frappe.cache().hget(PROFILE_CACHE_KEY, usr)
+    if context is None:
+        context = build_profile_context(usr) or {}
+        frappe.cache().hset(PROFILE_CACHE_KEY, usr, context)
+    return frappe._dict(context) if context else None
+
+def build_profile_context(usr):
+    pos_profile = frappe.db.get_value("POS Profile User",{"user":usr},"parent")
+    if not pos_profile or not frappe.db.exists("POS Profile", pos_profile):
+        return None
+
+    profile = frappe.get_doc("POS Profile", pos_profile)
+    context = {
+        "name": profile.name,
+        "company": profile.company,
+        "customer": profile.customer,
+        "warehouse": profile.warehouse,
+        "hide_unavailable_items": profile.hide_unavailable_items,
+        "selling_price_list": profile.selling_price_list,
+        "item_groups": [row.item_group for row in profile.item_groups],
+        "applicable_for_users": [row.user for row in profile.applicable_for_users]
+    }
+    for fieldname in RECEIPT_HEADER_FIELDS:
+        context[fieldname] = profile.get(fieldname)
+    return context
+
+def build_receipt_header(profile):
+    """Non-empty receipt header fields of a profile, with the logo as a full URL."""
+    header = {fieldname: profile.get(fieldname) for fieldname in RECEIPT_HEADER_FIELDS if profile.get(fieldname)}
+    if profile.get("custom_logo"):
+        header["custom_logo"] = frappe.utils.get_url() + profile.get("custom_logo")
+    return header
+
+def clear_profile_context(doc=None, method=None, *args):
+    """
+    doc_events handler for POS Profile. POS Profile User rows are only saved
+    through their parent profile, so this covers them too.
+    """
+    frappe.cache().delete_value(PROFILE_CACHE_KEY)
+    frappe.db.after_commit.add(lambda: frappe.cache().delete_value(PROFILE_CACHE_KEY))
+
+def clear_receipt_headers(doc=None, method=None, *args):
+    """doc_events handler for POS Profile: new receipt header versions."""
+    clear_versioned(RECEIPT_HEADER_CACHE_KEY)
@@ -0,0 +1,134 @@
+import datetime
+
+import frappe
+from frappe.utils import nowdate
+
+# Redis hash of item_code -> effective rate for one price list, customer and day
+PRICE_INDEX_KEY = "pos_app:price_index:{0}:{1}:{2}"
+# Set of "customer|date" entries that have an index built for a price list
+PRICE_INDEX_MEMBERS_KEY = "pos_app:price_index_members:{0}"
+PRICE_INDEX_TTL = 26 * 60 * 60
+BUILT_FIELD = "__built__"
+
+def get_price_rows(price_list, customer, date, item_codes=None):
+    conditions = ""
+    values = {"price_list": price_list, "customer": customer, "date": date}
+    if item_codes:
+        conditions = "AND ip.item_code IN %(item_codes)s"
+        values["item_codes"] = tuple(item_codes)
+
+    return frappe.db.sql(f"""
+        SELECT ip.item_code, ip.uom, ip.customer, ip.valid_from, ip.price_list_rate,
+            ip.modified, item.stock_uom
+        FROM `tabItem Price` ip
+        INNER JOIN `tabItem` item ON item.name = ip.item_code
+        WHERE ip.price_list = %(price_list)s
+            AND IFNULL(ip.batch_no, '') = ''
+            AND (ip.valid_from IS NULL OR ip.valid_from <= %(date)s)
+            AND (ip.valid_upto IS NULL OR ip.valid_upto >= %(date)s)
+            AND (IFNULL(ip.customer, '') = '' OR ip.customer = %(customer)s)
+            {conditions}
+    """, values, as_dict=True)
+
+def resolve_prices(rows, customer):
+    """
+    Effective rate per item: a price for the customer beats a general one,
+    rows in another UOM than the stock UOM are ignored, and the latest
+    valid_from (then the last modified row) wins.
+    """
+    best = {}
+    for row in rows:
+        if row.customer and row.customer != customer:
+            continue
+        if row.uom and row.uom != row.stock_uom:
+            continue
+        rank = (1 if row.customer else 0, row.valid_from or datetime.date.min, row.modified)
+        if row.item_code not in best or rank > best[row.item_code][0]:
+            best[row.item_code] = (rank, row.price_list_rate)
+    return {item_code: rate for item_code, (_, rate) in best.items()}
+
+def get_price_index(price_list, customer=None):
+    """
+    item_code -> effective rate for today, built in bulk on first use and kept
+    up to date by `update_price_index`.
+    """
+    if not price_list:
+        return {}
+
+    cache = frappe.cache()
+    date = nowdate()
+    key = cache.make_key(PRICE_INDEX_KEY.format(price_list, customer or "", date))
+    index = redis_call("hgetall", key)
+    if index:
+        return {k.decode(): float(v) for k, v in index.items() if k.decode() != BUILT_FIELD}
+
+    prices = resolve_prices(get_price_rows(price_list, customer, date), customer)
+    pipe = cache.pipeline()
+    pipe.hset(key, mapping=dict({k: str(v) for k, v in prices.items()}, **{BUILT_FIELD: 1}))
+    pipe.expire(key, PRICE_INDEX_TTL)
+    pipe.sadd(cache.make_key(PRICE_INDEX_MEMBERS_KEY.format(price_list)), f"{customer or ''}|{date}")
+    pipe.expire(cache.make_key(PRICE_INDEX_MEMBERS_KEY.format(price_list)), PRICE_INDEX_TTL)
+    pipe.execute()
+    return prices
+
+def get_item_price(price_list, customer, item_code):
+    """Effective rate of one item, read from the index without loading all of it."""
+    if not price_list:
+        return None
+
+    cache = frappe.cache()
+    key = cache.make_key(PRICE_INDEX_KEY.format(price_list, customer or "", nowdate()))
+    pipe = cache.pipeline()
+    pipe.hget(key, item_code)
+    pipe.hexists(key, BUILT_FIELD)
+    rate, built = pipe.execute()
+    if built:
+        return float(rate) if rate is not None else None
+    return get_price_index(price_list, customer).get(item_code)
+
+def redis_call(command, *args):
+    """
+    Run a raw Redis command on an already prefixed key; the RedisWrapper
+    overrides of some commands would prefix it again.
+    """
+    pipe = frappe.cache().pipeline()
+    getattr(pipe, command)(*args)
+    return pipe.execute()[0]
+
+def refresh_index_entries(price_list, item_codes):
+    """Re-resolve a few items in every index built for the price list."""
+    cache = frappe.cache()
+    members_key = cache.make_key(PRICE_INDEX_MEMBERS_KEY.format(price_list))
+    for member in redis_call("smembers", members_key):
+        customer, date = member.decode().split("|", 1)
+        key = cache.make_key(PRICE_INDEX_KEY.format(price_list, customer, date))
+        if not redis_call("exists", key):
+            redis_call("srem", members_key, member)
+            continue
+
+        prices = resolve_prices(get_price_rows(price_list, customer or None, date, item_codes), customer or None)
+        pipe = cache.pipeline()
+        for item_code in item_codes:
+            if item_code in prices:
+                pipe.hset(key, item_code, str(prices[item_code]))
+            else:
+                pipe.hdel(key, item_code)
+        pipe.execute()
+
+def update_price_index(doc, method=None):
+    """doc_events handler for Item Price: patch the affected item once committed."""
+    targets = {(doc.price_list, doc.item_code)}
+    before = doc.get_doc_before_save() if method == "on_update" else None
+    if before:
+        targets.add((before.price_list, before.item_code))
+
+    def refresh():
+        from pos_app.apis.item import CATALOG_CACHE_KEY
+
+        for price_list, item_code in targets:
+            if price_list and item_code:
+                refresh_index_entries(price_list, [item_code])
+        # Catalogs cached between the commit and the refresh used the old rate
+        frappe.cache().delete_value(CATALOG_CACHE_KEY)
+
+    frappe.db.after_commit.add(refresh)
@@ -0,0 +1,133 @@
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, now, nowdate
+from pos_app.apis.login import verify_jwt_token
+from pos_app.apis.pos_profile import get_profile_context
+from pos_app.apis.sales_invoice import build_bulk_invoice, validate_invoice_data
+
+CONSOLIDATE_BATCH_SIZE = 500
+# Claimed sales not posted within this many minutes are retried
+CLAIM_TIMEOUT_MINUTES = 60
+
+@frappe.whitelist(allow_guest=True)
+def capture_sales_invoice():
+    """
+    Record a sale without posting it. Only the payload shape is checked here;
+    `consolidate_captured_sales` turns captured sales into submitted invoices.
+    A retried capture with the same app_series returns the original capture.
+    """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
+
+    try:
+        data = json.loads(frappe.request.data)
+    except Exception:
+        frappe.throw(_("Invalid JSON request body."))
+
+    usr = result["payload"]["sub"]
+    profile = get_profile_context(usr)
+    default_customer = profile.customer if profile else None
+
+    try:
+        validate_invoice_data(data, default_customer)
+    except Exception as e:
+        frappe.local.response["http_status_code"] = 417
+        return {
+            "success_key": 0,
+            "message": str(e)
+        }
+
+    app_series = data.get("app_series")
+    existing = get_captured_sale(app_series)
+    if existing:
+        return existing
+
+    capture_id = frappe.generate_hash(length=20)
+    frappe.db.sql("""
+        INSERT IGNORE INTO `pos_captured_sale`
+            (name, app_series, pos_profile, user, default_customer, posting_date, payload, status, creation, modified)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, 'Captured', %s, %s)
+    """, (capture_id, app_series, profile.name if profile else None, usr, default_customer,
+        nowdate(), json.dumps(data), now(), now()))
+
+    # A concurrent retry may have taken the app_series first, dropping this row
+    return get_captured_sale(app_series, locking=True) or {
+        "success_key": 1,
+        "capture_id": capture_id,
+        "status": "Captured"
+    }
+
+def get_captured_sale(app_series, locking=False):
+    """
+    Stored capture of an app_series as the capture response, if any.
+    `locking` reads the latest committed row instead of the transaction snapshot.
+    """
+    if not app_series:
+        return None
+    lock_clause = "LOCK IN SHARE MODE" if locking else ""
+    existing = frappe.db.sql(f"""
+        SELECT name, status, invoice_name FROM `pos_captured_sale` WHERE app_series = %s {lock_clause}
+    """, (app_series,), as_dict=True)
+    if not existing:
+        return None
+    return {
+        "success_key": 1,
+        "capture_id": existing[0].name,
+        "status": existing[0].status,
+        "invoice_name": existing[0].invoice_name
+    }
+
+def consolidate_captured_sales():
+    """
+    Scheduled job: post captured sales as submitted Sales Invoices, grouped by
+    profile and shift (user and sale date), keeping each sale's own date.
+    Sales are claimed first so overlapping runs never post the same sale twice.
+    """
+    frappe.db.sql("""
+        UPDATE `pos_captured_sale` SET status = 'Captured', claim = NULL
+        WHERE status = 'Posting' AND modified < %s
+    """, (add_to_date(now(), minutes=-CLAIM_TIMEOUT_MINUTES),))
+
+    claim = frappe.generate_hash(length=20)
+    frappe.db.sql("""
+        UPDATE `pos_captured_sale` SET status = 'Posting', claim = %s, modified = %s
+        WHERE status = 'Captured'
+        ORDER BY creation
+        LIMIT %s
+    """, (claim, now(), CONSOLIDATE_BATCH_SIZE))
+    frappe.db.commit()
+
+    sales = frappe.db.sql("""
+        SELECT name, pos_profile, user, default_customer, posting_date, payload
+        FROM `pos_captured_sale`
+        WHERE claim = %s
+        ORDER BY pos_profile, user, posting_date, creation
+    """, (claim,), as_dict=True)
+
+    for sale in sales:
+        current_user = frappe.session.user
+        try:
+            # Post as the cashier, like a direct create_sales_invoice call
+            frappe.set_user(sale.user)
+            invoice_name = build_bulk_invoice(json.loads(sale.payload), sale.default_customer,
+                sale.posting_date, sale.pos_profile)
+            frappe.db.sql("""
+                UPDATE `pos_captured_sale`
+                SET status = 'Posted', invoice_name = %s, modified = %s
+                WHERE name = %s
+            """, (invoice_name, now(), sale.name))
+        except Exception as e:
+            frappe.db.rollback()
+            frappe.log_error(frappe.get_traceback(), "POS Captured Sale Error")
+            frappe.db.sql("""
+                UPDATE `pos_captured_sale`
+                SET status = 'Failed', error = %s, modified = %s
+                WHERE name = %s
+            """, (str(e), now(), sale.name))
+        finally:
+            frappe.set_user(current_user)
+        frappe.db.commit()
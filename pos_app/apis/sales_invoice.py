@@ -1,9 +1,32 @@
+import csv
+import io
 import json
 import frappe
+from collections import defaultdict
 from frappe import _
-from frappe.utils import nowdate, getdate
+from frappe.utils import add_days, cint, now, nowdate, getdate
 from datetime import datetime
 from pos_app.apis.login import verify_jwt_token
+from pos_app.apis.pos_profile import get_profile_context
+from werkzeug.wrappers import Response
+
+HISTORY_PAGE_SIZE = 100
+HISTORY_MAX_PAGE_SIZE = 500
+EXPORT_CHUNK_SIZE = 500
+BULK_CHUNK_SIZE = 25
+BULK_JOB_RETENTION_DAYS = 7
+EXPORT_CSV_COLUMNS = [
+    "name", "posting_date", "customer", "grand_total", "status", "mobile_no", "app_series",
+    "item_code", "item_name", "qty", "rate", "amount", "payments"
+]
+
+def get_existing_invoice(app_series):
+    """
+    Name of the invoice already created for this app_series (unique index).
+    """
+    if not app_series:
+        return None
+    return frappe.db.get_value("Sales Invoice", {"app_series": app_series}, "name")
 
 @frappe.whitelist(allow_guest=True)
 def create_sales_invoice():
@@ -28,9 +51,8 @@ def create_sales_invoice():
 
     # Extract required fields
     usr = payload["sub"]
-    pos_profile = frappe.db.get_value("POS Profile User",{"user":usr},"parent")
-    if pos_profile:
-        profile = frappe.get_doc("POS Profile", pos_profile)
+    profile = get_profile_context(usr)
+    if profile:
         customer = profile.customer
     else:
         customer = data.get("customer")
@@ -46,15 +68,27 @@ def create_sales_invoice():
     if not isinstance(items, list) or not items:
         frappe.throw(_("Items must be a non-empty list."))
 
+    # app_series is the idempotency key: a retried submission gets the original invoice
+    existing = get_existing_invoice(app_series)
+    if existing:
+        return {
+            "success_key": 1,
+            "message": "Sales Invoice already exists",
+            "name": existing
+        }
+
     try:
         # Create Sales Invoice
         doc = frappe.new_doc("Sales Invoice")
         doc.customer = customer
         doc.due_date = due_date
         doc.posting_date = nowdate()
-        doc.custom_mobile_no = mobile
+        doc.mobile_no = mobile
         doc.app_series = app_series
         doc.is_pos = 1
+        doc.is_sent_from_mobile = 1
+        if profile:
+            doc.pos_profile = profile.name
         for item in items:
             if not item.get("item_code") or not item.get("qty"):
                 frappe.throw(_("Each item must have 'item_code' and 'qty'."))
@@ -78,69 +112,363 @@ def create_sales_invoice():
             "name": doc.name
         }
 
+    except frappe.UniqueValidationError:
+        # A concurrent retry created it first; drop the "must be unique" message too
+        frappe.db.rollback()
+        frappe.clear_messages()
+        existing = get_existing_invoice(app_series)
+        if not existing:
+            raise
+        return {
+            "success_key": 1,
+            "message": "Sales Invoice already exists",
+            "name": existing
+        }
+
     except Exception as e:
         frappe.log_error(frappe.get_traceback(), "Sales Invoice API Error")
         frappe.throw(_("Failed to create Sales Invoice: {0}").format(str(e)))
 
 
-@frappe.whitelist(allow_guest=True)
-def sales_invoice_history(from_date=None, to_date=None, min_amount=None, max_amount=None):
+def attach_invoice_children(invoices):
     """
-    API to get Sales Invoices by date and amount filters with items and payments.
+    Fetch items and payments for all invoices with one query per child table.
     """
-    try:
-        verify_jwt_token()
-    except Exception as e:
-        frappe.throw(_("Unauthorized: {0}").format(str(e)))
+    names = [inv["name"] for inv in invoices]
+    items_map = defaultdict(list)
+    payments_map = defaultdict(list)
+    if names:
+        for row in frappe.get_all("Sales Invoice Item",
+                filters={"parenttype": "Sales Invoice", "parent": ["in", names]},
+                fields=["parent", "item_code", "item_name", "qty", "rate", "amount"],
+                order_by="parent, idx"):
+            items_map[row.pop("parent")].append(row)
+        for row in frappe.get_all("Sales Invoice Payment",
+                filters={"parenttype": "Sales Invoice", "parent": ["in", names]},
+                fields=["parent", "mode_of_payment", "amount"],
+                order_by="parent, idx"):
+            payments_map[row.pop("parent")].append(row)
 
-    # Build filters
-    conditions = []
+    for inv in invoices:
+        inv["items"] = items_map.get(inv["name"], [])
+        inv["payments"] = payments_map.get(inv["name"], [])
+    return invoices
+
+def get_history_owners(usr):
+    """Users whose invoices the caller sees: everyone on their POS Profile, or only themselves."""
+    profile = get_profile_context(usr)
+    if profile and usr in profile.applicable_for_users:
+        return sorted(profile.applicable_for_users)
+    return [usr]
+
+def get_history_conditions(usr, from_date=None, to_date=None, min_amount=None, max_amount=None):
+    """
+    Filters of the app's own invoices of the user's POS Profile (or only
+    their own without one). With a profile both the filter and the
+    (posting_date, name) order are read from the
+    (is_sent_from_mobile, pos_profile, posting_date, name) index.
+    """
+    profile = get_profile_context(usr)
+    if profile and usr in profile.applicable_for_users:
+        conditions = ["is_sent_from_mobile = 1", "pos_profile = %(pos_profile)s"]
+        values = {"pos_profile": profile.name}
+    else:
+        conditions = ["is_sent_from_mobile = 1", "owner = %(owner)s"]
+        values = {"owner": usr}
     if from_date:
-        from_date = getdate(from_date)
+        values["from_date"] = getdate(from_date)
         conditions.append("posting_date >= %(from_date)s")
     if to_date:
-        to_date = getdate(to_date)
+        values["to_date"] = getdate(to_date)
         conditions.append("posting_date <= %(to_date)s")
     if min_amount:
-        min_amount = float(min_amount)
+        values["min_amount"] = float(min_amount)
         conditions.append("grand_total >= %(min_amount)s")
     if max_amount:
-        max_amount = float(max_amount)
+        values["max_amount"] = float(max_amount)
         conditions.append("grand_total <= %(max_amount)s")
+    return conditions, values
+
+def fetch_invoices(conditions, values, after=None, limit=HISTORY_PAGE_SIZE):
+    """
+    One keyset page of invoices ordered by (posting_date, name) descending,
+    starting after the `(posting_date, name)` pair in `after`.
+    """
+    conditions = list(conditions)
+    values = dict(values, limit=limit)
+    if after:
+        values["cursor_date"], values["cursor_name"] = after
+        conditions.append("""(posting_date < %(cursor_date)s
+            OR (posting_date = %(cursor_date)s AND name < %(cursor_name)s))""")
 
     where_clause = " AND ".join(conditions) if conditions else "1=1"
     query = f"""
         SELECT name, customer, posting_date, grand_total, status,mobile_no, app_series
         FROM `tabSales Invoice`
         WHERE {where_clause}
-        ORDER BY posting_date DESC
+        ORDER BY posting_date DESC, name DESC
+        LIMIT %(limit)s
+    """
+    return frappe.db.sql(query, values, as_dict=True)
+
+@frappe.whitelist(allow_guest=True)
+def sales_invoice_history(from_date=None, to_date=None, min_amount=None, max_amount=None,
+        cursor=None, page_size=None):
+    """
+    API to get the app's Sales Invoices of the caller's POS Profile by date and
+    amount filters with items and payments.
+    Results are paged newest first; pass the returned `next_cursor` to get the next page.
     """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
 
-    invoices = frappe.db.sql(query, {
-        "from_date": from_date,
-        "to_date": to_date,
-        "min_amount": min_amount,
-        "max_amount": max_amount
-    }, as_dict=True)
+    # Build filters
+    conditions, values = get_history_conditions(result["payload"]["sub"], from_date, to_date, min_amount, max_amount)
 
-    # Fetch items and payments separately
-    for inv in invoices:
-        inv["items"] = frappe.get_all("Sales Invoice Item", filters={"parent": inv["name"]},
-                                      fields=["item_code", "item_name", "qty", "rate", "amount"])
-        inv["payments"] = frappe.get_all("Sales Invoice Payment", filters={"parent": inv["name"]},
-                                         fields=["mode_of_payment", "amount"])
+    after = None
+    if cursor:
+        try:
+            cursor_date, cursor_name = cursor.split("|", 1)
+            after = (getdate(cursor_date), cursor_name)
+        except Exception:
+            frappe.throw(_("Invalid cursor."))
+
+    page_size = max(1, min(cint(page_size) or HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE))
+    invoices = fetch_invoices(conditions, values, after=after, limit=page_size + 1)
+
+    next_cursor = None
+    if len(invoices) > page_size:
+        invoices = invoices[:page_size]
+        last = invoices[-1]
+        next_cursor = f"{last['posting_date']}|{last['name']}"
+
+    attach_invoice_children(invoices)
 
     return {
         "success_key": 1,
-        "sales_invoices": invoices
+        "sales_invoices": invoices,
+        "next_cursor": next_cursor
     }
 
+def iter_invoices(conditions, values):
+    after = None
+    while True:
+        invoices = fetch_invoices(conditions, values, after=after, limit=EXPORT_CHUNK_SIZE)
+        if not invoices:
+            return
+        yield from attach_invoice_children(invoices)
+        if len(invoices) < EXPORT_CHUNK_SIZE:
+            return
+        after = (invoices[-1]["posting_date"], invoices[-1]["name"])
+
+def write_ndjson(invoices):
+    for inv in invoices:
+        yield frappe.as_json(inv, indent=None) + "\n"
+
+def write_csv(invoices):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    for inv in invoices:
+        payments = ";".join(f"{p.mode_of_payment}:{p.amount}" for p in inv["payments"])
+        for item in inv["items"] or [frappe._dict()]:
+            writer.writerow([
+                inv.name, inv.posting_date, inv.customer, inv.grand_total, inv.status,
+                inv.mobile_no, inv.app_series, item.item_code, item.item_name,
+                item.qty, item.rate, item.amount, payments
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+@frappe.whitelist(allow_guest=True)
+def export_sales_invoice_history(from_date=None, to_date=None, min_amount=None, max_amount=None,
+        file_format="ndjson"):
+    """
+    Stream the app's Sales Invoices of the caller's POS Profile with items and
+    payments as NDJSON or CSV.
+    Invoices are read in keyset chunks so memory stays flat for any date range.
+    """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
+
+    if file_format not in ("ndjson", "csv"):
+        frappe.throw(_("Format must be 'ndjson' or 'csv'."))
+
+    conditions, values = get_history_conditions(result["payload"]["sub"], from_date, to_date, min_amount, max_amount)
+    writer = write_csv if file_format == "csv" else write_ndjson
+
+    def generate():
+        # The request's connection is closed before the body is sent;
+        # frappe.db reconnects lazily and is closed again once streaming ends.
+        try:
+            yield from writer(iter_invoices(conditions, values))
+        finally:
+            if frappe.db:
+                frappe.db.close()
+
+    mimetype = "text/csv" if file_format == "csv" else "application/x-ndjson"
+    response = Response(generate(), mimetype=mimetype, direct_passthrough=True)
+    response.headers["Content-Disposition"] = f'attachment; filename="sales_invoices.{file_format}"'
+    return response
+
+def validate_invoice_data(invoice_data, default_customer=None):
+    """
+    Basic shape checks of one invoice payload, raising on invalid data.
+    """
+    customer = default_customer or invoice_data.get("customer")
+    items = invoice_data.get("items")
+    payments = invoice_data.get("payments")
+
+    if not customer or not invoice_data.get("due_date") or not items:
+        raise Exception(_("Missing mandatory fields: customer, due_date, or items."))
+
+    if not isinstance(items, list) or not items:
+        raise Exception(_("Items must be a non-empty list."))
+
+    if not isinstance(payments, list) or not payments:
+        raise Exception(_("Payments must be a non-empty list."))
+
+    for item in items:
+        if not item.get("item_code") or not item.get("qty"):
+            raise Exception(_("Each item must have 'item_code' and 'qty'."))
+
+    for pay in payments:
+        if not pay.get("mode_of_payment") or not pay.get("amount"):
+            raise Exception(_("Each payment must have 'mode_of_payment' and 'amount'."))
+
+    return customer
+
+def build_bulk_invoice(invoice_data, default_customer=None, posting_date=None, pos_profile=None):
+    """
+    Insert and submit one invoice of a bulk payload, raising on invalid data.
+    `posting_date` keeps the date of a sale that is posted later.
+    """
+    customer = validate_invoice_data(invoice_data, default_customer)
+    app_series = invoice_data.get("app_series")
+
+    existing = get_existing_invoice(app_series)
+    if existing:
+        return existing
+
+    # Create Sales Invoice
+    doc = frappe.new_doc("Sales Invoice")
+    doc.customer = customer
+    doc.due_date = invoice_data["due_date"]
+    if posting_date:
+        doc.set_posting_time = 1
+        doc.posting_date = posting_date
+    else:
+        doc.posting_date = nowdate()
+    doc.mobile_no = invoice_data.get("mobile_no")
+    doc.app_series = app_series
+    doc.is_pos = 1
+    doc.is_sent_from_mobile = 1
+    if pos_profile:
+        doc.pos_profile = pos_profile
+
+    # Add items
+    for item in invoice_data["items"]:
+        doc.append("items", {
+            "item_code": item["item_code"],
+            "qty": item["qty"],
+            "rate": item.get("rate")
+        })
+
+    # Add payments
+    for pay in invoice_data["payments"]:
+        doc.append("payments", {
+            "mode_of_payment": pay["mode_of_payment"],
+            "amount": pay["amount"]
+        })
+
+    try:
+        doc.insert(ignore_permissions=True)
+    except frappe.UniqueValidationError:
+        frappe.db.rollback()
+        frappe.clear_messages()
+        existing = get_existing_invoice(app_series)
+        if not existing:
+            raise
+        return existing
+    doc.submit()
+    return doc.name
+
+def get_master_status(doctype, names, fields):
+    """`fields` of the given records of `doctype`, by name, in one query."""
+    if not names:
+        return {}
+    rows = frappe.db.sql(f"""
+        SELECT name, {", ".join(fields)} FROM `tab{doctype}` WHERE name IN %(names)s
+    """, {"names": tuple(names)}, as_dict=True)
+    return {row.name: row for row in rows}
+
+def prevalidate_invoices(invoices_data, default_customer=None):
+    """
+    Check a whole batch before any insert: payload shape per invoice, then
+    every distinct item, mode of payment and customer with one query per
+    doctype. Returns {index: [errors]} for the invoices to reject.
+    """
+    errors = defaultdict(list)
+    customers = {}
+    for idx, invoice_data in enumerate(invoices_data):
+        try:
+            customers[idx] = validate_invoice_data(invoice_data, default_customer)
+        except Exception as e:
+            errors[idx].append({"field": None, "value": None, "message": str(e)})
+
+    valid = [idx for idx in range(len(invoices_data)) if idx not in errors]
+    item_codes = {item["item_code"] for idx in valid for item in invoices_data[idx]["items"]}
+    modes = {pay["mode_of_payment"] for idx in valid for pay in invoices_data[idx]["payments"]}
+
+    items = get_master_status("Item", item_codes, ["disabled", "is_sales_item", "has_variants"])
+    modes_of_payment = get_master_status("Mode of Payment", modes, ["enabled"])
+    customer_status = get_master_status("Customer", set(customers.values()), ["disabled"])
+
+    def reject(idx, field, value, message):
+        errors[idx].append({"field": field, "value": value, "message": message})
+
+    for idx in valid:
+        invoice_data = invoices_data[idx]
+        customer = customers[idx]
+        if customer not in customer_status:
+            reject(idx, "customer", customer, _("Customer {0} not found").format(customer))
+        elif customer_status[customer].disabled:
+            reject(idx, "customer", customer, _("Customer {0} is disabled").format(customer))
+
+        for item_code in dict.fromkeys(item["item_code"] for item in invoice_data["items"]):
+            item = items.get(item_code)
+            if not item:
+                reject(idx, "item_code", item_code, _("Item {0} not found").format(item_code))
+            elif item.disabled:
+                reject(idx, "item_code", item_code, _("Item {0} is disabled").format(item_code))
+            elif not item.is_sales_item:
+                reject(idx, "item_code", item_code, _("Item {0} is not a sales item").format(item_code))
+            elif item.has_variants:
+                reject(idx, "item_code", item_code, _("Item {0} is a template, select a variant").format(item_code))
+
+        for mode in dict.fromkeys(pay["mode_of_payment"] for pay in invoice_data["payments"]):
+            if mode not in modes_of_payment:
+                reject(idx, "mode_of_payment", mode, _("Mode of Payment {0} not found").format(mode))
+            elif not modes_of_payment[mode].enabled:
+                reject(idx, "mode_of_payment", mode, _("Mode of Payment {0} is disabled").format(mode))
+
+    return errors
+
 @frappe.whitelist(allow_guest=True)
 def create_bulk_sales_invoices():
     """
-    Create multiple Sales Invoices from a single API call.
+    Queue multiple Sales Invoices from a single API call.
     Expects request body to be a JSON object with key 'invoices'.
     Each invoice must include: customer, due_date, items (list), payments (list)
+    Invoices with unknown or disabled items, modes of payment or customers are
+    rejected up front and returned in `rejected`; the rest is staged and
+    created by background jobs. Poll `get_bulk_sales_invoices_status` with
+    the returned job_id for the results.
     """
     result = verify_jwt_token()
     if result["status"] == "error":
@@ -160,77 +488,128 @@ def create_bulk_sales_invoices():
     payload = result["payload"]
     usr = payload["sub"]
     
-    pos_profile = frappe.db.get_value("POS Profile User", {"user": usr}, "parent")
-    default_customer = frappe.get_value("POS Profile", pos_profile, "customer") if pos_profile else None
+    profile = get_profile_context(usr)
+    default_customer = profile.customer if profile else None
 
-    created_invoices = []
-    errors = []
+    errors = prevalidate_invoices(invoices_data, default_customer)
 
+    job_id = frappe.generate_hash(length=20)
+    frappe.db.sql("""
+        INSERT INTO `pos_bulk_invoice_job` (name, user, pos_profile, default_customer, total, creation)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (job_id, usr, profile.name if profile else None, default_customer, len(invoices_data), now()))
     for idx, invoice_data in enumerate(invoices_data):
+        if idx in errors:
+            frappe.db.sql("""
+                INSERT INTO `pos_bulk_invoice_job_item` (job, idx, payload, status, error, modified)
+                VALUES (%s, %s, %s, 'Failed', %s, %s)
+            """, (job_id, idx, json.dumps(invoice_data),
+                "; ".join(e["message"] for e in errors[idx]), now()))
+        else:
+            frappe.db.sql("""
+                INSERT INTO `pos_bulk_invoice_job_item` (job, idx, payload, status, modified)
+                VALUES (%s, %s, %s, 'Queued', %s)
+            """, (job_id, idx, json.dumps(invoice_data), now()))
+
+    for start in range(0, len(invoices_data), BULK_CHUNK_SIZE):
+        # Skip chunks with nothing left to create
+        if all(idx in errors for idx in range(start, min(start + BULK_CHUNK_SIZE, len(invoices_data)))):
+            continue
+        frappe.enqueue(
+            "pos_app.apis.sales_invoice.process_bulk_invoice_chunk",
+            queue="long",
+            enqueue_after_commit=True,
+            batch_id=job_id,
+            start=start,
+            end=start + BULK_CHUNK_SIZE
+        )
+
+    return {
+        "success_key": 1,
+        "job_id": job_id,
+        "total": len(invoices_data),
+        "rejected": [{"index": idx, "errors": errors[idx]} for idx in sorted(errors)]
+    }
+
+def process_bulk_invoice_chunk(batch_id, start, end):
+    """
+    Background job: create the staged invoices with index in [start, end).
+    Each invoice is committed on its own so status polling sees progress.
+    """
+    pos_profile, default_customer = frappe.db.sql("""
+        SELECT pos_profile, default_customer FROM `pos_bulk_invoice_job` WHERE name = %s
+    """, (batch_id,))[0]
+    rows = frappe.db.sql("""
+        SELECT idx, payload FROM `pos_bulk_invoice_job_item`
+        WHERE job = %s AND idx >= %s AND idx < %s AND status = 'Queued'
+        ORDER BY idx
+    """, (batch_id, start, end), as_dict=True)
+
+    for row in rows:
         try:
-            # Fields
-            customer = default_customer or invoice_data.get("customer")
-            due_date = invoice_data.get("due_date")
-            items = invoice_data.get("items")
-            payments = invoice_data.get("payments")
-            mobile = invoice_data.get("mobile_no")
-            app_series = invoice_data.get("app_series")
-
-            if not customer or not due_date or not items:
-                raise Exception(_("Missing mandatory fields: customer, due_date, or items."))
-
-            if not isinstance(items, list) or not items:
-                raise Exception(_("Items must be a non-empty list."))
-
-            if not isinstance(payments, list) or not payments:
-                raise Exception(_("Payments must be a non-empty list."))
-
-            # Create Sales Invoice
-            doc = frappe.new_doc("Sales Invoice")
-            doc.customer = customer
-            doc.due_date = due_date
-            doc.posting_date = nowdate()
-            doc.custom_mobile_no = mobile
-            doc.app_series = app_series
-            doc.is_pos = 1
-
-            # Add items
-            for item in items:
-                if not item.get("item_code") or not item.get("qty"):
-                    raise Exception(_("Each item must have 'item_code' and 'qty'."))
-                doc.append("items", {
-                    "item_code": item["item_code"],
-                    "qty": item["qty"],
-                    "rate": item.get("rate")
-                })
+            invoice_name = build_bulk_invoice(json.loads(row.payload), default_customer, pos_profile=pos_profile)
+            frappe.db.sql("""
+                UPDATE `pos_bulk_invoice_job_item`
+                SET status = 'Created', invoice_name = %s, modified = %s
+                WHERE job = %s AND idx = %s
+            """, (invoice_name, now(), batch_id, row.idx))
+        except Exception as e:
+            frappe.db.rollback()
+            frappe.log_error(frappe.get_traceback(), "Bulk Sales Invoice Error")
+            frappe.db.sql("""
+                UPDATE `pos_bulk_invoice_job_item`
+                SET status = 'Failed', error = %s, modified = %s
+                WHERE job = %s AND idx = %s
+            """, (str(e), now(), batch_id, row.idx))
+        frappe.db.commit()
 
-            # Add payments
-            for pay in payments:
-                if not pay.get("mode_of_payment") or not pay.get("amount"):
-                    raise Exception(_("Each payment must have 'mode_of_payment' and 'amount'."))
-                doc.append("payments", {
-                    "mode_of_payment": pay["mode_of_payment"],
-                    "amount": pay["amount"]
-                })
+@frappe.whitelist(allow_guest=True)
+def get_bulk_sales_invoices_status(job_id=None):
+    """
+    Progress of a bulk job: created invoice names and errors per index.
+    """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
 
-            doc.insert(ignore_permissions=True)
-            doc.submit()
+    job = frappe.db.sql("""
+        SELECT name, total FROM `pos_bulk_invoice_job` WHERE name = %s AND user = %s
+    """, (job_id, result["payload"]["sub"]), as_dict=True)
+    if not job:
+        frappe.local.response["http_status_code"] = 404
+        return {
+            "status": "error",
+            "code": 404,
+            "message": "Job not found"
+        }
 
-            created_invoices.append({
-                "index": idx,
-                "invoice_name": doc.name
-            })
+    rows = frappe.db.sql("""
+        SELECT idx, status, invoice_name, error FROM `pos_bulk_invoice_job_item`
+        WHERE job = %s ORDER BY idx
+    """, (job_id,), as_dict=True)
 
-        except Exception as e:
-            frappe.log_error(frappe.get_traceback(), "Bulk Sales Invoice Error")
-            errors.append({
-                "index": idx,
-                "error": str(e),
-                "data": invoice_data
-            })
+    created_invoices = [{"index": r.idx, "invoice_name": r.invoice_name} for r in rows if r.status == "Created"]
+    errors = [{"index": r.idx, "error": r.error} for r in rows if r.status == "Failed"]
+    pending = job[0].total - len(created_invoices) - len(errors)
 
     return {
         "success_key": 1 if not errors else 0,
+        "job_id": job_id,
+        "status": "Completed" if not pending else "Queued",
+        "total": job[0].total,
+        "pending": pending,
         "created_invoices": created_invoices,
         "errors": errors
-    }
\ No newline at end of file
+    }
+
+def purge_bulk_invoice_jobs():
+    """Scheduled job: drop staged bulk batches older than BULK_JOB_RETENTION_DAYS."""
+    cutoff = add_days(now(), -BULK_JOB_RETENTION_DAYS)
+    frappe.db.sql("""
+        DELETE item FROM `pos_bulk_invoice_job_item` item
+        INNER JOIN `pos_bulk_invoice_job` job ON job.name = item.job
+        WHERE job.creation < %s
+    """, (cutoff,))
+    frappe.db.sql("DELETE FROM `pos_bulk_invoice_job` WHERE creation < %s", (cutoff,))
+    frappe.db.commit()
@@ -0,0 +1,151 @@
+from collections import defaultdict
+
+import frappe
+from frappe.utils import getdate
+from pos_app.apis.login import verify_jwt_token
+from pos_app.apis.pos_profile import get_profile_context
+
+# Rows with an empty mode_of_payment hold the invoice count and grand total of the day
+TOTAL_ROW = ""
+
+# idx of the payment row the change is given from, as in get_change_row
+CHANGE_ROW_EXPRESSION = """COALESCE(
+    (SELECT MIN(p.idx) FROM `tabSales Invoice Payment` p
+        WHERE p.parent = si.name AND p.parenttype = 'Sales Invoice' AND p.account = si.account_for_change_amount),
+    (SELECT MIN(p.idx) FROM `tabSales Invoice Payment` p
+        WHERE p.parent = si.name AND p.parenttype = 'Sales Invoice' AND p.type = 'Cash'),
+    (SELECT MIN(p.idx) FROM `tabSales Invoice Payment` p
+        WHERE p.parent = si.name AND p.parenttype = 'Sales Invoice'))"""
+
+def get_change_row(doc):
+    """Payment row the change is given from: the change account's row, else cash, else the first."""
+    payments = sorted(doc.payments, key=lambda pay: pay.idx)
+    return (next((pay for pay in payments if pay.account and pay.account == doc.account_for_change_amount), None)
+        or next((pay for pay in payments if pay.type == "Cash"), None)
+        or (payments[0] if payments else None))
+
+def get_net_payments(doc):
+    """Amount per mode of payment with the change given back taken off."""
+    payments = defaultdict(float)
+    for pay in doc.payments:
+        payments[pay.mode_of_payment] += pay.amount
+    change_row = get_change_row(doc) if doc.change_amount else None
+    if change_row:
+        payments[change_row.mode_of_payment] -= doc.change_amount
+    return payments
+
+def add_to_rollup(posting_date, pos_profile, mode_of_payment, invoice_count, amount):
+    frappe.db.sql("""
+        INSERT INTO `pos_daily_sales` (posting_date, pos_profile, mode_of_payment, invoice_count, amount)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            invoice_count = invoice_count + VALUES(invoice_count),
+            amount = amount + VALUES(amount)
+    """, (posting_date, pos_profile, mode_of_payment, invoice_count, amount))
+
+def update_daily_sales(doc, method=None):
+    """
+    doc_events handler for Sales Invoice on_submit / on_cancel. The invoice's
+    own pos_profile is used, so a cancel always reverses the same rows.
+    """
+    pos_profile = doc.pos_profile
+    if not pos_profile:
+        return
+
+    sign = -1 if method == "on_cancel" else 1
+    add_to_rollup(doc.posting_date, pos_profile, TOTAL_ROW, sign, sign * doc.grand_total)
+
+    for mode_of_payment, amount in get_net_payments(doc).items():
+        add_to_rollup(doc.posting_date, pos_profile, mode_of_payment, sign, sign * amount)
+
+def backfill_daily_sales(from_date=None):
+    """
+    Rebuild the rollup from submitted invoices, for all dates or from `from_date`.
+    Run with `bench --site <site> execute pos_app.apis.sales_rollup.backfill_daily_sales`.
+    """
+    values = {"from_date": getdate(from_date) if from_date else None}
+    date_condition = "AND si.posting_date >= %(from_date)s" if from_date else ""
+
+    if from_date:
+        frappe.db.sql("DELETE FROM `pos_daily_sales` WHERE posting_date >= %(from_date)s", values)
+    else:
+        frappe.db.sql("DELETE FROM `pos_daily_sales`")
+
+    frappe.db.sql(f"""
+        INSERT INTO `pos_daily_sales` (posting_date, pos_profile, mode_of_payment, invoice_count, amount)
+        SELECT si.posting_date, si.pos_profile, '', COUNT(*), SUM(si.grand_total)
+        FROM `tabSales Invoice` si
+        WHERE si.docstatus = 1 AND IFNULL(si.pos_profile, '') != '' {date_condition}
+        GROUP BY si.posting_date, si.pos_profile
+    """, values)
+
+    frappe.db.sql(f"""
+        INSERT INTO `pos_daily_sales` (posting_date, pos_profile, mode_of_payment, invoice_count, amount)
+        SELECT posting_date, pos_profile, mode_of_payment, COUNT(DISTINCT invoice), SUM(amount)
+        FROM (
+            SELECT si.name AS invoice, si.posting_date, si.pos_profile, pay.mode_of_payment,
+                pay.amount - IF(si.change_amount != 0 AND pay.idx = {CHANGE_ROW_EXPRESSION}, si.change_amount, 0) AS amount
+            FROM `tabSales Invoice` si
+            INNER JOIN `tabSales Invoice Payment` pay
+                ON pay.parent = si.name AND pay.parenttype = 'Sales Invoice'
+            WHERE si.docstatus = 1 AND IFNULL(si.pos_profile, '') != '' {date_condition}
+        ) payments
+        GROUP BY posting_date, pos_profile, mode_of_payment
+    """, values)
+    frappe.db.commit()
+
+@frappe.whitelist(allow_guest=True)
+def get_daily_sales_summary(from_date=None, to_date=None):
+    """
+    Sales per day and mode of payment for the caller's POS Profile, read from
+    the rollup table.
+    """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
+
+    profile = get_profile_context(result["payload"]["sub"])
+    if not profile:
+        frappe.local.response["http_status_code"] = 404
+        return {
+            "status": "error",
+            "code": 404,
+            "message": "No POS Profile for this user"
+        }
+
+    conditions = ["pos_profile = %(pos_profile)s"]
+    values = {"pos_profile": profile.name}
+    if from_date:
+        values["from_date"] = getdate(from_date)
+        conditions.append("posting_date >= %(from_date)s")
+    if to_date:
+        values["to_date"] = getdate(to_date)
+        conditions.append("posting_date <= %(to_date)s")
+
+    rows = frappe.db.sql(f"""
+        SELECT posting_date, mode_of_payment, invoice_count, amount
+        FROM `pos_daily_sales`
+        WHERE {" AND ".join(conditions)}
+        ORDER BY posting_date DESC
+    """, values, as_dict=True)
+
+    days = {}
+    for row in rows:
+        day = days.setdefault(row.posting_date, {
+            "posting_date": row.posting_date,
+            "invoice_count": 0,
+            "total": 0.0,
+            "payments": {}
+        })
+        if row.mode_of_payment == TOTAL_ROW:
+            day["invoice_count"] = row.invoice_count
+            day["total"] = row.amount
+        else:
+            day["payments"][row.mode_of_payment] = row.amount
+
+    return {
+        "success_key": 1,
+        "pos_profile": profile.name,
+        "days": list(days.values())
+    }
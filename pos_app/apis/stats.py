@@ -0,0 +1,136 @@
+import time
+
+import frappe
+from frappe.utils import cint
+
+STATS_KEY = "pos_app:stats:{0}:{1}"
+STATS_ENDPOINTS_KEY = "pos_app:stats:endpoints"
+STATS_WINDOW_MINUTES = 60
+# Upper bounds (ms) of the latency histogram buckets
+LATENCY_BUCKETS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+def get_endpoint(request):
+    """
+    Whitelisted `pos_app.apis.*` method called by the request, if any. Other
+    paths under the prefix are not recorded, so they can't grow the stats keys.
+    """
+    path = request.path if request else ""
+    if "/method/" not in path:
+        return None
+    method = path.rsplit("/method/", 1)[1].strip("/")
+    if not method.startswith("pos_app.apis."):
+        return None
+    try:
+        fn = frappe.get_attr(method)
+    except Exception:
+        return None
+    return method if fn in frappe.whitelisted else None
+
+def start_request():
+    """before_request hook: start timing and count queries of POS API calls."""
+    endpoint = get_endpoint(frappe.request)
+    if not endpoint:
+        return
+
+    stats = frappe.local.pos_stats = frappe._dict(
+        endpoint=endpoint, start=time.perf_counter(), queries=0, query_time=0.0)
+    sql = frappe.db.sql
+
+    def timed_sql(*args, **kwargs):
+        query_start = time.perf_counter()
+        try:
+            return sql(*args, **kwargs)
+        finally:
+            stats.queries += 1
+            stats.query_time += time.perf_counter() - query_start
+
+    # frappe.db is created per request, so this goes away with it
+    frappe.db.sql = timed_sql
+
+def record_request(response=None, request=None):
+    """after_request hook: add the call to the endpoint's per-minute histogram."""
+    stats = getattr(frappe.local, "pos_stats", None)
+    if not stats:
+        return
+    frappe.local.pos_stats = None
+    if response is not None and response.status_code == 404:
+        return
+
+    elapsed_ms = (time.perf_counter() - stats.start) * 1000
+    size = response.calculate_content_length() if response is not None else None
+    bucket = next((b for b in LATENCY_BUCKETS if elapsed_ms <= b), "inf")
+    key = frappe.cache().make_key(STATS_KEY.format(int(time.time() // 60), stats.endpoint))
+
+    pipe = frappe.cache().pipeline()
+    pipe.hincrby(key, "count", 1)
+    pipe.hincrbyfloat(key, "time_ms", elapsed_ms)
+    pipe.hincrby(key, "queries", stats.queries)
+    pipe.hincrbyfloat(key, "query_time_ms", stats.query_time * 1000)
+    pipe.hincrby(key, "bytes", size or 0)
+    pipe.hincrby(key, f"le_{bucket}", 1)
+    if response is not None and response.status_code >= 400:
+        pipe.hincrby(key, "errors", 1)
+    pipe.expire(key, (STATS_WINDOW_MINUTES + 1) * 60)
+    endpoints_key = frappe.cache().make_key(STATS_ENDPOINTS_KEY)
+    pipe.sadd(endpoints_key, stats.endpoint)
+    pipe.expire(endpoints_key, (STATS_WINDOW_MINUTES + 1) * 60)
+    pipe.execute()
+
+def estimate_percentile(histogram, count, pct):
+    target = count * pct / 100
+    seen = 0
+    for bucket in LATENCY_BUCKETS + ["inf"]:
+        seen += histogram.get(f"le_{bucket}", 0)
+        if seen >= target:
+            return bucket
+    return "inf"
+
+@frappe.whitelist()
+def get_endpoint_stats(minutes=STATS_WINDOW_MINUTES):
+    """
+    Latency, query and response size aggregates per POS endpoint over the last
+    `minutes`. Percentiles are histogram bucket upper bounds in ms.
+    """
+    frappe.only_for("System Manager")
+
+    minutes = min(cint(minutes) or STATS_WINDOW_MINUTES, STATS_WINDOW_MINUTES)
+    current = int(time.time() // 60)
+    cache = frappe.cache()
+    pipe = cache.pipeline()
+    pipe.smembers(cache.make_key(STATS_ENDPOINTS_KEY))
+    endpoints = sorted(e.decode() for e in pipe.execute()[0])
+
+    pipe = cache.pipeline()
+    for endpoint in endpoints:
+        for minute in range(current - minutes + 1, current + 1):
+            pipe.hgetall(cache.make_key(STATS_KEY.format(minute, endpoint)))
+    buckets = iter(pipe.execute())
+
+    result = []
+    for endpoint in endpoints:
+        totals = {}
+        for _ in range(minutes):
+            for field, value in next(buckets).items():
+                field = field.decode()
+                totals[field] = totals.get(field, 0) + float(value)
+
+        count = int(totals.get("count", 0))
+        if not count:
+            continue
+        result.append({
+            "endpoint": endpoint,
+            "count": count,
+            "errors": int(totals.get("errors", 0)),
+            "avg_ms": round(totals["time_ms"] / count, 2),
+            "p50_ms": estimate_percentile(totals, count, 50),
+            "p95_ms": estimate_percentile(totals, count, 95),
+            "p99_ms": estimate_percentile(totals, count, 99),
+            "avg_queries": round(totals["queries"] / count, 1),
+            "avg_query_ms": round(totals["query_time_ms"] / count, 2),
+            "avg_bytes": int(totals["bytes"] / count)
+        })
+
+    return {
+        "minutes": minutes,
+        "endpoints": result
+    }
@@ -0,0 +1,135 @@
+import gzip
+import hashlib
+import os
+
+import frappe
+from frappe.utils import now
+from pos_app.apis.item import build_catalog, get_catalog_items, get_price_map, has_user_permission
+from pos_app.apis.login import verify_jwt_token
+from pos_app.apis.pos_profile import build_receipt_header, get_profile_context
+
+BUNDLE_CACHE_KEY = "pos_app:sync_bundles"
+BUNDLE_FOLDER = "pos_bundles"
+
+def get_bundle_data(pos_profile):
+    """Everything a terminal on this profile needs to start offline."""
+    profile = frappe.get_doc("POS Profile", pos_profile)
+    item_groups = sorted(row.item_group for row in profile.item_groups)
+    scope = frappe._dict(
+        price_list=profile.selling_price_list,
+        customer=profile.customer,
+        item_groups=item_groups or None,
+        warehouse=None,
+        hide_unavailable_items=0
+    )
+    items = get_catalog_items(scope)
+    catalog = build_catalog(items, get_price_map(scope, [item["name"] for item in items]))
+
+    receipt_header = build_receipt_header(profile)
+
+    return {
+        "pos_profile": profile.name,
+        "customer": profile.customer,
+        "price_list": profile.selling_price_list,
+        "receipt_header": receipt_header,
+        "modes_of_payment": [
+            {"mode_of_payment": row.mode_of_payment, "default": row.default}
+            for row in profile.payments
+        ],
+        "items": catalog
+    }
+
+def build_sync_bundle(pos_profile):
+    """
+    Write the profile's bundle as gzipped JSON named after its content hash and
+    record it in the manifest. Unchanged data keeps its version and file.
+    """
+    data = get_bundle_data(pos_profile)
+    content = frappe.as_json(data, indent=None).encode()
+    version = hashlib.sha1(content).hexdigest()[:16]
+
+    manifest = frappe.cache().hget(BUNDLE_CACHE_KEY, pos_profile)
+    if manifest and manifest["version"] == version:
+        return manifest
+
+    folder = frappe.get_site_path("public", "files", BUNDLE_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+    file_name = f"{frappe.scrub(pos_profile)}-{version}.json.gz"
+    with open(os.path.join(folder, file_name), "wb") as f:
+        f.write(gzip.compress(content, compresslevel=9))
+
+    # Keep the previous file for downloads in flight, drop the one before it
+    if manifest and manifest.get("previous"):
+        previous_path = os.path.join(folder, manifest["previous"])
+        if os.path.exists(previous_path):
+            os.remove(previous_path)
+
+    new_manifest = {
+        "version": version,
+        "url": f"/files/{BUNDLE_FOLDER}/{file_name}",
+        "file_name": file_name,
+        "previous": manifest["file_name"] if manifest else None,
+        "generated_at": now()
+    }
+    frappe.cache().hset(BUNDLE_CACHE_KEY, pos_profile, new_manifest)
+    return new_manifest
+
+def build_all_sync_bundles():
+    """Background / daily job: rebuild the bundle of every enabled POS Profile."""
+    for pos_profile in frappe.get_all("POS Profile", filters={"disabled": 0}, pluck="name"):
+        try:
+            build_sync_bundle(pos_profile)
+        except Exception:
+            frappe.log_error(frappe.get_traceback(), "POS Sync Bundle Error")
+
+def queue_sync_bundles(doc=None, method=None):
+    """doc_events handler: rebuild bundles once the change is committed."""
+    frappe.enqueue(
+        "pos_app.apis.sync_bundle.build_all_sync_bundles",
+        queue="long",
+        job_id="pos_app_build_sync_bundles",
+        deduplicate=True,
+        enqueue_after_commit=True
+    )
+
+@frappe.whitelist(allow_guest=True)
+def get_sync_bundle(version=None):
+    """
+    Version check for the caller's profile bundle. The download url is only
+    returned when the bundle differs from the `version` the device already has.
+    """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
+
+    usr = result["payload"]["sub"]
+    profile = get_profile_context(usr)
+    if not profile:
+        frappe.local.response["http_status_code"] = 404
+        return {
+            "status": "error",
+            "code": 404,
+            "message": "No POS Profile for this user"
+        }
+    if usr not in profile.applicable_for_users:
+        return "users not applicable with this pos profile"
+
+    # Bundles are shared per profile; per-user Item Group restrictions need get_pos_items
+    if has_user_permission(usr=usr, allow="Item Group"):
+        frappe.local.response["http_status_code"] = 409
+        return {
+            "status": "error",
+            "code": 409,
+            "message": "Item Group permissions apply, use get_pos_items"
+        }
+
+    manifest = frappe.cache().hget(BUNDLE_CACHE_KEY, profile.name) or build_sync_bundle(profile.name)
+    changed = manifest["version"] != version
+    return {
+        "status": "success",
+        "version": manifest["version"],
+        "changed": changed,
+        "url": frappe.utils.get_url() + manifest["url"] if changed else None,
+        "generated_at": manifest["generated_at"]
+    }
@@ -0,0 +1,13 @@
+from frappe.tests.utils import FrappeTestCase
+from pos_app.apis.customer import normalize_phone
+
+class TestNormalizePhone(FrappeTestCase):
+    def test_keeps_digits_only(self):
+        self.assertEqual(normalize_phone("+968 9123-4567"), "96891234567")
+        self.assertEqual(normalize_phone("(0) 91 23 45 67"), "091234567")
+        self.assertEqual(normalize_phone("96891234567"), "96891234567")
+
+    def test_empty_values(self):
+        self.assertEqual(normalize_phone(None), "")
+        self.assertEqual(normalize_phone(""), "")
+        self.assertEqual(normalize_phone("n/a"), "")
@@ -0,0 +1,36 @@
+from unittest.mock import patch
+
+from frappe.tests.utils import FrappeTestCase
+from pos_app.apis.item import to_columns
+
+SITE_URL = "https://pos.example.com"
+
+@patch("frappe.utils.get_url", return_value=SITE_URL)
+class TestToColumns(FrappeTestCase):
+    def test_rows_become_columns(self, _):
+        catalog = [
+            {"item_code": "ITEM-1", "item_name": "Tea", "image": SITE_URL + "/files/tea.png",
+                "thumbnail": SITE_URL + "/files/tea_small.png", "price": 1.5},
+            {"item_code": "ITEM-2", "item_name": "Cake", "image": None, "thumbnail": None, "price": None},
+        ]
+        self.assertEqual(to_columns(catalog), {
+            "base_url": SITE_URL,
+            "count": 2,
+            "columns": {
+                "item_code": ["ITEM-1", "ITEM-2"],
+                "item_name": ["Tea", "Cake"],
+                "image": ["/files/tea.png", None],
+                "thumbnail": ["/files/tea_small.png", None],
+                "price": [1.5, None],
+            }
+        })
+
+    def test_other_hosts_are_kept(self, _):
+        catalog = [{"item_code": "ITEM-1", "image": "https://cdn.example.com/tea.png"}]
+        self.assertEqual(to_columns(catalog)["columns"]["image"], ["https://cdn.example.com/tea.png"])
+
+    def test_empty_catalog_keeps_the_columns(self, _):
+        result = to_columns([])
+        self.assertEqual(result["count"], 0)
+        self.assertEqual(set(result["columns"]), {"item_code", "item_name", "image", "thumbnail", "price"})
+        self.assertTrue(all(values == [] for values in result["columns"].values()))
@@ -0,0 +1,49 @@
+import datetime
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from pos_app.apis.price_index import resolve_prices
+
+def price_row(rate, customer=None, uom="Nos", stock_uom="Nos", valid_from=None,
+        modified=datetime.datetime(2024, 1, 1), item_code="ITEM-1"):
+    return frappe._dict(item_code=item_code, price_list_rate=rate, customer=customer, uom=uom,
+        stock_uom=stock_uom, valid_from=valid_from, modified=modified)
+
+class TestResolvePrices(FrappeTestCase):
+    def test_customer_price_beats_general(self):
+        rows = [
+            price_row(10, valid_from=datetime.date(2024, 6, 1)),
+            price_row(8, customer="CUST-1", valid_from=datetime.date(2024, 1, 1)),
+        ]
+        self.assertEqual(resolve_prices(rows, "CUST-1"), {"ITEM-1": 8})
+
+    def test_other_customers_price_is_ignored(self):
+        rows = [price_row(10), price_row(8, customer="CUST-2")]
+        self.assertEqual(resolve_prices(rows, "CUST-1"), {"ITEM-1": 10})
+        self.assertEqual(resolve_prices(rows, None), {"ITEM-1": 10})
+
+    def test_other_uom_is_ignored(self):
+        rows = [price_row(10), price_row(100, uom="Box")]
+        self.assertEqual(resolve_prices(rows, None), {"ITEM-1": 10})
+
+    def test_missing_uom_counts_as_stock_uom(self):
+        self.assertEqual(resolve_prices([price_row(10, uom=None)], None), {"ITEM-1": 10})
+
+    def test_latest_valid_from_wins(self):
+        rows = [
+            price_row(12, valid_from=datetime.date(2024, 6, 1)),
+            price_row(10, valid_from=datetime.date(2024, 1, 1), modified=datetime.datetime(2024, 7, 1)),
+            price_row(9, modified=datetime.datetime(2024, 8, 1)),
+        ]
+        self.assertEqual(resolve_prices(rows, None), {"ITEM-1": 12})
+
+    def test_last_modified_breaks_ties(self):
+        rows = [
+            price_row(10, modified=datetime.datetime(2024, 1, 1)),
+            price_row(11, modified=datetime.datetime(2024, 2, 1)),
+        ]
+        self.assertEqual(resolve_prices(rows, None), {"ITEM-1": 11})
+
+    def test_items_are_resolved_separately(self):
+        rows = [price_row(10), price_row(20, item_code="ITEM-2"), price_row(100, uom="Box", item_code="ITEM-3")]
+        self.assertEqual(resolve_prices(rows, None), {"ITEM-1": 10, "ITEM-2": 20})
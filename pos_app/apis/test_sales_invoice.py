@@ -0,0 +1,128 @@
+import datetime
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from pos_app.apis.sales_invoice import fetch_invoices, prevalidate_invoices, sales_invoice_history
+
+MASTERS = {
+    "Item": {
+        "ITEM-1": frappe._dict(name="ITEM-1", disabled=0, is_sales_item=1, has_variants=0),
+        "ITEM-OFF": frappe._dict(name="ITEM-OFF", disabled=1, is_sales_item=1, has_variants=0),
+        "ITEM-BUY": frappe._dict(name="ITEM-BUY", disabled=0, is_sales_item=0, has_variants=0),
+        "ITEM-TPL": frappe._dict(name="ITEM-TPL", disabled=0, is_sales_item=1, has_variants=1),
+    },
+    "Mode of Payment": {
+        "Cash": frappe._dict(name="Cash", enabled=1),
+        "Cheque": frappe._dict(name="Cheque", enabled=0),
+    },
+    "Customer": {
+        "CUST-1": frappe._dict(name="CUST-1", disabled=0),
+        "CUST-OFF": frappe._dict(name="CUST-OFF", disabled=1),
+    },
+}
+
+def get_master_status(doctype, names, fields):
+    return {name: row for name, row in MASTERS[doctype].items() if name in names}
+
+def invoice(customer="CUST-1", items=("ITEM-1",), modes=("Cash",)):
+    return {
+        "customer": customer,
+        "due_date": "2024-01-31",
+        "items": [{"item_code": item_code, "qty": 1, "rate": 10} for item_code in items],
+        "payments": [{"mode_of_payment": mode, "amount": 10} for mode in modes]
+    }
+
+@patch("pos_app.apis.sales_invoice.get_master_status", side_effect=get_master_status)
+class TestPrevalidateInvoices(FrappeTestCase):
+    def test_valid_batch_has_no_errors(self, _):
+        self.assertEqual(dict(prevalidate_invoices([invoice(), invoice()])), {})
+
+    def test_errors_are_per_index(self, _):
+        errors = prevalidate_invoices([
+            invoice(),
+            invoice(items=("ITEM-1", "ITEM-OFF", "ITEM-BUY", "ITEM-TPL", "ITEM-NONE")),
+            invoice(),
+            invoice(customer="CUST-OFF", modes=("Cash", "Cheque", "Barter")),
+        ])
+        self.assertEqual(set(errors), {1, 3})
+        self.assertEqual([(e["field"], e["value"]) for e in errors[1]], [
+            ("item_code", "ITEM-OFF"),
+            ("item_code", "ITEM-BUY"),
+            ("item_code", "ITEM-TPL"),
+            ("item_code", "ITEM-NONE"),
+        ])
+        self.assertEqual([(e["field"], e["value"]) for e in errors[3]], [
+            ("customer", "CUST-OFF"),
+            ("mode_of_payment", "Cheque"),
+            ("mode_of_payment", "Barter"),
+        ])
+        self.assertTrue(all(e["message"] for e in errors[1] + errors[3]))
+
+    def test_repeated_item_is_reported_once(self, _):
+        errors = prevalidate_invoices([invoice(items=("ITEM-OFF", "ITEM-OFF"))])
+        self.assertEqual(len(errors[0]), 1)
+
+    def test_unknown_customer(self, _):
+        errors = prevalidate_invoices([invoice(customer="CUST-NONE")])
+        self.assertEqual(errors[0][0]["field"], "customer")
+        self.assertEqual(errors[0][0]["value"], "CUST-NONE")
+
+    def test_default_customer_is_used(self, _):
+        self.assertEqual(dict(prevalidate_invoices([invoice(customer=None)], "CUST-1")), {})
+
+    def test_invalid_shape_skips_master_checks(self, get_master_status):
+        bad = invoice(items=("ITEM-NONE",))
+        bad["payments"] = []
+        errors = prevalidate_invoices([bad, invoice()])
+        self.assertEqual(list(errors), [0])
+        self.assertEqual(len(errors[0]), 1)
+        self.assertIsNone(errors[0][0]["field"])
+        item_codes = next(c.args[1] for c in get_master_status.call_args_list if c.args[0] == "Item")
+        self.assertNotIn("ITEM-NONE", item_codes)
+
+class TestHistoryCursor(FrappeTestCase):
+    def test_first_page_has_no_cursor_condition(self):
+        with patch.object(frappe.db, "sql", return_value=[]) as sql:
+            fetch_invoices(["is_sent_from_mobile = 1"], {}, limit=11)
+        query, values = sql.call_args.args
+        self.assertNotIn("cursor_date", query)
+        self.assertIn("ORDER BY posting_date DESC, name DESC", query)
+        self.assertEqual(values, {"limit": 11})
+
+    def test_cursor_continues_after_date_and_name(self):
+        after = (datetime.date(2024, 1, 2), "SINV-0005")
+        with patch.object(frappe.db, "sql", return_value=[]) as sql:
+            fetch_invoices(["is_sent_from_mobile = 1"], {}, after=after, limit=11)
+        query, values = sql.call_args.args
+        self.assertIn("posting_date < %(cursor_date)s", query)
+        self.assertIn("posting_date = %(cursor_date)s AND name < %(cursor_name)s", query)
+        self.assertEqual((values["cursor_date"], values["cursor_name"]), after)
+
+    def test_pages_cover_every_invoice_once(self):
+        # Several invoices share a posting_date, so pages split inside a day
+        invoices = sorted((frappe._dict(posting_date=datetime.date(2024, 1, day), name=f"SINV-{n:04d}")
+            for day in (1, 2, 3) for n in range(day * 10, day * 10 + 4)),
+            key=lambda inv: (inv.posting_date, inv.name), reverse=True)
+
+        def fake_fetch(conditions, values, after=None, limit=None):
+            rows = [inv for inv in invoices if not after or (inv.posting_date, inv.name) < after]
+            return [frappe._dict(inv) for inv in rows[:limit]]
+
+        seen, cursor = [], None
+        with patch("pos_app.apis.sales_invoice.verify_jwt_token",
+                return_value={"status": "success", "payload": {"sub": "pos@example.com"}}), \
+                patch("pos_app.apis.sales_invoice.get_history_conditions", return_value=([], {})), \
+                patch("pos_app.apis.sales_invoice.fetch_invoices", side_effect=fake_fetch), \
+                patch("pos_app.apis.sales_invoice.attach_invoice_children"):
+            while True:
+                page = sales_invoice_history(cursor=cursor, page_size=5)
+                self.assertLessEqual(len(page["sales_invoices"]), 5)
+                seen += [inv.name for inv in page["sales_invoices"]]
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+
+            self.assertEqual(len(sales_invoice_history(page_size=-5)["sales_invoices"]), 1)
+
+        self.assertEqual(seen, [inv.name for inv in invoices])
@@ -0,0 +1,38 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from pos_app.apis.sales_rollup import get_change_row, get_net_payments
+
+def invoice(payments, change_amount=0, account_for_change_amount=None):
+    return frappe._dict(
+        payments=[frappe._dict(idx=idx, **pay) for idx, pay in enumerate(payments, 1)],
+        change_amount=change_amount,
+        account_for_change_amount=account_for_change_amount
+    )
+
+CARD = {"mode_of_payment": "Card", "amount": 50, "account": "Bank - C", "type": "Bank"}
+CASH = {"mode_of_payment": "Cash", "amount": 60, "account": "Cash - C", "type": "Cash"}
+
+class TestSalesRollup(FrappeTestCase):
+    def test_change_row_is_the_change_account_row(self):
+        doc = invoice([CASH, CARD], change_amount=10, account_for_change_amount="Bank - C")
+        self.assertEqual(get_change_row(doc).mode_of_payment, "Card")
+
+    def test_change_row_falls_back_to_cash(self):
+        doc = invoice([CARD, CASH], change_amount=10, account_for_change_amount="Other - C")
+        self.assertEqual(get_change_row(doc).mode_of_payment, "Cash")
+
+    def test_change_row_falls_back_to_first_row(self):
+        doc = invoice([CARD, dict(CARD, mode_of_payment="Wallet", account="Wallet - C")], change_amount=10)
+        self.assertEqual(get_change_row(doc).mode_of_payment, "Card")
+        self.assertIsNone(get_change_row(invoice([])))
+
+    def test_net_payments_without_change(self):
+        doc = invoice([CARD, CASH, dict(CASH, amount=15)])
+        self.assertEqual(dict(get_net_payments(doc)), {"Card": 50, "Cash": 75})
+
+    def test_net_payments_take_change_off_its_row(self):
+        doc = invoice([CARD, CASH], change_amount=10, account_for_change_amount="Cash - C")
+        self.assertEqual(dict(get_net_payments(doc)), {"Card": 50, "Cash": 50})
+
+        doc = invoice([CARD, CASH], change_amount=10)
+        self.assertEqual(dict(get_net_payments(doc)), {"Card": 50, "Cash": 50})
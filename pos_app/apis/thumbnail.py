@@ -0,0 +1,111 @@
+import hashlib
+import io
+import os
+from urllib.parse import unquote
+
+import frappe
+from PIL import Image, ImageOps
+
+THUMBNAIL_SIZE = 256
+THUMBNAIL_FOLDER = "pos_thumbnails"
+THUMBNAIL_CACHE_KEY = "pos_app:thumbnails"
+# Hash value of files that are missing or can't be read as an image, so they aren't retried
+FAILED_THUMBNAIL = ""
+
+def get_thumbnail_urls(file_urls):
+    """
+    Map of file_url -> thumbnail url for the files that already have one.
+    Missing thumbnails are generated by a background job, so callers never
+    wait on image resizing. Files that failed before are not queued again.
+    """
+    thumbnails = frappe.cache().hgetall(THUMBNAIL_CACHE_KEY) or {}
+    missing = sorted({url for url in file_urls if is_public_file(url) and url not in thumbnails})
+    if missing:
+        frappe.enqueue(
+            "pos_app.apis.thumbnail.generate_thumbnails",
+            queue="long",
+            job_id="pos_app_generate_thumbnails",
+            deduplicate=True,
+            file_urls=missing
+        )
+    return {url: thumbnail for url, thumbnail in thumbnails.items() if thumbnail != FAILED_THUMBNAIL}
+
+def get_thumbnail_url(file_url):
+    """
+    Thumbnail url of a single file, read with one hash lookup; queued for
+    generation like `get_thumbnail_urls` when it has none yet.
+    """
+    if not is_public_file(file_url):
+        return None
+    thumbnail = frappe.cache().hget(THUMBNAIL_CACHE_KEY, file_url)
+    if thumbnail is None:
+        frappe.enqueue(
+            "pos_app.apis.thumbnail.generate_thumbnails",
+            queue="long",
+            job_id="pos_app_generate_thumbnails",
+            deduplicate=True,
+            file_urls=[file_url]
+        )
+    return thumbnail or None
+
+def is_public_file(file_url):
+    return bool(file_url) and file_url.startswith("/files/") and f"/{THUMBNAIL_FOLDER}/" not in file_url
+
+def make_thumbnail(file_url):
+    """
+    Write a resized WEBP copy of a public file named after its content hash.
+    The name changes whenever the image does, so the URL can be cached as immutable.
+    """
+    path = frappe.get_site_path("public", unquote(file_url).lstrip("/"))
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        content = f.read()
+
+    thumbnail_name = f"{hashlib.sha1(content).hexdigest()[:16]}-{THUMBNAIL_SIZE}.webp"
+    folder = frappe.get_site_path("public", "files", THUMBNAIL_FOLDER)
+    thumbnail_path = os.path.join(folder, thumbnail_name)
+    if not os.path.exists(thumbnail_path):
+        os.makedirs(folder, exist_ok=True)
+        image = ImageOps.exif_transpose(Image.open(io.BytesIO(content)))
+        image.thumbnail((THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        image.save(thumbnail_path, "WEBP", quality=80)
+
+    return f"/files/{THUMBNAIL_FOLDER}/{thumbnail_name}"
+
+def generate_thumbnails(file_urls):
+    from pos_app.apis.item import clear_catalog_cache
+    from pos_app.apis.sync_bundle import queue_sync_bundles
+
+    added = False
+    for file_url in file_urls:
+        try:
+            thumbnail_url = make_thumbnail(file_url)
+        except Exception:
+            frappe.log_error(frappe.get_traceback(), "POS Thumbnail Error")
+            thumbnail_url = None
+
+        thumbnail_url = thumbnail_url or FAILED_THUMBNAIL
+        if frappe.cache().hget(THUMBNAIL_CACHE_KEY, file_url) == thumbnail_url:
+            continue
+        frappe.cache().hset(THUMBNAIL_CACHE_KEY, file_url, thumbnail_url)
+        added = added or thumbnail_url != FAILED_THUMBNAIL
+
+    # Cached catalogs and bundles were built without these thumbnails
+    if added:
+        clear_catalog_cache()
+        queue_sync_bundles()
+    frappe.db.commit()
+
+def queue_item_thumbnail(doc, method=None):
+    """doc_events handler: build the thumbnail as soon as an Item image is uploaded."""
+    if doc.image and doc.has_value_changed("image") and is_public_file(doc.image):
+        frappe.enqueue(
+            "pos_app.apis.thumbnail.generate_thumbnails",
+            queue="long",
+            enqueue_after_commit=True,
+            file_urls=[doc.image]
+        )
@@ -1,8 +1,50 @@
 import frappe
 from frappe import _
+from pos_app.apis.http_cache import clear_versioned, get_versioned, make_conditional_response
+from pos_app.apis.login import verify_jwt_token
+from pos_app.apis.pos_profile import RECEIPT_HEADER_CACHE_KEY, build_receipt_header, get_profile_context
+
+APP_SETTINGS_CACHE_KEY = "pos_app:app_settings"
+
+def clear_app_settings_cache():
+    """Called from POSAppSettings.on_update: the next request gets a new ETag."""
+    clear_versioned(APP_SETTINGS_CACHE_KEY)
+
+def build_app_logo():
+    settings = frappe.get_cached_doc("POS App Settings")
+    logo = frappe.utils.get_url() + settings.pos_logo if settings.pos_logo else None
+    return logo, settings.modified
 
 @frappe.whitelist(allow_guest=True)
 def get_app_logo():
-    site_url = frappe.utils.get_url()
-    app_logo_file = frappe.get_doc("POS App Settings").pos_logo
-    return site_url + app_logo_file
\ No newline at end of file
+    """
+    Logo URL from POS App Settings. Honours If-None-Match / If-Modified-Since,
+    so an unchanged logo costs a 304 from the cache.
+    """
+    return make_conditional_response(get_versioned(APP_SETTINGS_CACHE_KEY, "logo", build_app_logo))
+
+@frappe.whitelist(allow_guest=True)
+def get_receipt_header():
+    """
+    Receipt header of the caller's POS Profile, with the same conditional
+    GET handling as `get_app_logo`.
+    """
+    result = verify_jwt_token()
+    if result["status"] == "error":
+        frappe.local.response["http_status_code"] = result["code"]
+        return result
+
+    profile = get_profile_context(result["payload"]["sub"])
+    if not profile:
+        frappe.local.response["http_status_code"] = 404
+        return {
+            "status": "error",
+            "code": 404,
+            "message": "No POS Profile for this user"
+        }
+
+    def build():
+        doc = frappe.get_doc("POS Profile", profile.name)
+        return build_receipt_header(doc), doc.modified
+
+    return make_conditional_response(get_versioned(RECEIPT_HEADER_CACHE_KEY, profile.name, build))
@@ -0,0 +1,8 @@
+# Benchmarks for the POS APIs, run against a disposable site:
+#
+#   bench --site test_site execute pos_app.benchmarks.seed --kwargs "{'items': 5000}"
+#   bench --site test_site execute pos_app.benchmarks.run --kwargs "{'iterations': 100}"
+#   bench --site test_site execute pos_app.benchmarks.cleanup
+
+from pos_app.benchmarks.data import cleanup, seed
+from pos_app.benchmarks.runner import run
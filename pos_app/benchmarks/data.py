@@ -0,0 +1,193 @@
+import random
+
+import frappe
+from frappe.utils import add_days, now, nowdate
+
+PREFIX = "BENCH"
+PASSWORD = "bench-Pa55word!"
+PRICE_LIST = f"{PREFIX} Selling"
+CUSTOMER = f"{PREFIX} Customer"
+
+def seed(items=1000, item_groups=20, profiles=2, users=10, invoices=1000, seed=42):
+    """
+    Create a reproducible synthetic data set for the benchmarks.
+    All records are prefixed with BENCH so `cleanup` can remove them again.
+    """
+    rng = random.Random(seed)
+    company = frappe.defaults.get_global_default("company") or frappe.get_all("Company", pluck="name")[0]
+
+    setup_masters(company)
+    groups = make_item_groups(item_groups)
+    item_codes = make_items(items, groups, rng)
+    make_users(users)
+    make_profiles(company, profiles, users, groups)
+    make_invoices(company, invoices, item_codes, get_bench_users(users), profiles, rng)
+    frappe.db.commit()
+
+    return {
+        "company": company,
+        "items": len(item_codes),
+        "item_groups": len(groups["leaves"]) + len(groups["parents"]),
+        "profiles": profiles,
+        "users": users,
+        "invoices": invoices
+    }
+
+def setup_masters(company):
+    if not frappe.db.exists("Price List", PRICE_LIST):
+        frappe.get_doc({
+            "doctype": "Price List",
+            "price_list_name": PRICE_LIST,
+            "selling": 1,
+            "currency": frappe.get_cached_value("Company", company, "default_currency")
+        }).insert(ignore_permissions=True)
+
+    if not frappe.db.exists("Customer", CUSTOMER):
+        frappe.get_doc({
+            "doctype": "Customer",
+            "customer_name": CUSTOMER,
+            "customer_group": frappe.db.get_value("Customer Group", {"is_group": 0}),
+            "territory": frappe.db.get_value("Territory", {"is_group": 0})
+        }).insert(ignore_permissions=True)
+
+def make_item_groups(count):
+    """A two level tree: a quarter of the groups are parents of the rest."""
+    parent_count = max(1, count // 4)
+    parents = [f"{PREFIX} Group {i:03d}" for i in range(parent_count)]
+    leaves = [f"{PREFIX} Group {i:03d}" for i in range(parent_count, count)]
+
+    for name in parents:
+        insert_item_group(name, "All Item Groups", is_group=1)
+    for i, name in enumerate(leaves):
+        insert_item_group(name, parents[i % parent_count])
+
+    return {"parents": parents, "leaves": leaves or parents}
+
+def insert_item_group(name, parent, is_group=0):
+    if not frappe.db.exists("Item Group", name):
+        frappe.get_doc({
+            "doctype": "Item Group",
+            "item_group_name": name,
+            "parent_item_group": parent,
+            "is_group": is_group
+        }).insert(ignore_permissions=True)
+
+def make_items(count, groups, rng):
+    item_codes = []
+    for i in range(count):
+        item_code = f"{PREFIX}-ITEM-{i:06d}"
+        item_codes.append(item_code)
+        if frappe.db.exists("Item", item_code):
+            continue
+        frappe.get_doc({
+            "doctype": "Item",
+            "item_code": item_code,
+            "item_name": f"{PREFIX} Item {i}",
+            "item_group": groups["leaves"][i % len(groups["leaves"])],
+            "stock_uom": "Nos",
+            "is_stock_item": 0
+        }).insert(ignore_permissions=True)
+        frappe.get_doc({
+            "doctype": "Item Price",
+            "item_code": item_code,
+            "price_list": PRICE_LIST,
+            "price_list_rate": rng.randint(100, 100000) / 100
+        }).insert(ignore_permissions=True)
+    return item_codes
+
+def get_bench_users(count):
+    return [f"{PREFIX.lower()}-user-{i:04d}@example.com" for i in range(count)]
+
+def make_users(count):
+    for email in get_bench_users(count):
+        if frappe.db.exists("User", email):
+            continue
+        frappe.get_doc({
+            "doctype": "User",
+            "email": email,
+            "first_name": email.split("@")[0],
+            "new_password": PASSWORD,
+            "send_welcome_email": 0,
+            "roles": [{"role": "Sales User"}, {"role": "Accounts User"}]
+        }).insert(ignore_permissions=True)
+
+def make_profiles(company, count, user_count, groups):
+    users = get_bench_users(user_count)
+    write_off_account, cost_center, currency = frappe.get_cached_value(
+        "Company", company, ["write_off_account", "cost_center", "default_currency"])
+    warehouse = frappe.db.get_value("Warehouse", {"company": company, "is_group": 0})
+
+    for i in range(count):
+        name = f"{PREFIX} Profile {i:02d}"
+        if frappe.db.exists("POS Profile", name):
+            continue
+        frappe.get_doc({
+            "doctype": "POS Profile",
+            "company": company,
+            "customer": CUSTOMER,
+            "warehouse": warehouse,
+            "currency": currency,
+            "selling_price_list": PRICE_LIST,
+            "write_off_account": write_off_account,
+            "write_off_cost_center": cost_center,
+            "payments": [{"mode_of_payment": "Cash", "default": 1}],
+            "item_groups": [{"item_group": g} for g in groups["parents"][i::count]],
+            "applicable_for_users": [{"user": u, "default": 1} for u in users[i::count]]
+        }).insert(ignore_permissions=True, set_name=name)
+
+def make_invoices(company, count, item_codes, users, profiles, rng):
+    """
+    History rows are written directly: sales_invoice_history only reads the
+    invoice and child tables, and submitting thousands of invoices would take hours.
+    """
+    timestamp = now()
+    invoices, items, payments = [], [], []
+    for i in range(count):
+        name = f"{PREFIX}-SINV-{i:07d}"
+        posting_date = add_days(nowdate(), -rng.randint(0, 365))
+        rows = [(rng.choice(item_codes), rng.randint(1, 5), rng.randint(100, 10000) / 100)
+            for _ in range(rng.randint(1, 5))]
+        grand_total = sum(qty * rate for _, qty, rate in rows)
+
+        invoices.append((name, CUSTOMER, company, posting_date, posting_date, grand_total,
+            "Paid", 1, 1, 1, f"{PREFIX}-{i}", f"{PREFIX} Profile {i % len(users) % profiles:02d}",
+            timestamp, timestamp, users[i % len(users)], "Administrator"))
+        for idx, (item_code, qty, rate) in enumerate(rows, 1):
+            items.append((frappe.generate_hash(length=12), name, "Sales Invoice", "items", idx,
+                item_code, item_code, qty, rate, qty * rate, 1, timestamp, timestamp))
+        payments.append((frappe.generate_hash(length=12), name, "Sales Invoice", "payments", 1,
+            "Cash", grand_total, 1, timestamp, timestamp))
+
+    frappe.db.bulk_insert("Sales Invoice",
+        fields=["name", "customer", "company", "posting_date", "due_date", "grand_total",
+            "status", "docstatus", "is_pos", "is_sent_from_mobile", "app_series", "pos_profile", "creation", "modified", "owner", "modified_by"],
+        values=invoices, ignore_duplicates=True)
+    frappe.db.bulk_insert("Sales Invoice Item",
+        fields=["name", "parent", "parenttype", "parentfield", "idx",
+            "item_code", "item_name", "qty", "rate", "amount", "docstatus", "creation", "modified"],
+        values=items, ignore_duplicates=True)
+    frappe.db.bulk_insert("Sales Invoice Payment",
+        fields=["name", "parent", "parenttype", "parentfield", "idx",
+            "mode_of_payment", "amount", "docstatus", "creation", "modified"],
+        values=payments, ignore_duplicates=True)
+
+def cleanup():
+    """Remove everything `seed` created."""
+    like = f"{PREFIX}%"
+    for doctype in ("Sales Invoice Item", "Sales Invoice Payment"):
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE parent LIKE %s", (like,))
+    frappe.db.sql("DELETE FROM `tabSales Invoice` WHERE name LIKE %s", (like,))
+
+    for name in frappe.get_all("POS Profile", filters={"name": ["like", like]}, pluck="name"):
+        frappe.delete_doc("POS Profile", name, force=True, ignore_permissions=True)
+    frappe.db.sql("DELETE FROM `tabItem Price` WHERE price_list = %s", (PRICE_LIST,))
+    for name in frappe.get_all("Item", filters={"name": ["like", like]}, pluck="name"):
+        frappe.delete_doc("Item", name, force=True, ignore_permissions=True)
+    for name in frappe.get_all("Item Group", filters={"name": ["like", like]}, order_by="lft desc", pluck="name"):
+        frappe.delete_doc("Item Group", name, force=True, ignore_permissions=True)
+    for name in frappe.get_all("User", filters={"name": ["like", f"{PREFIX.lower()}-user-%"]}, pluck="name"):
+        frappe.delete_doc("User", name, force=True, ignore_permissions=True)
+    for doctype, name in (("Customer", CUSTOMER), ("Price List", PRICE_LIST)):
+        if frappe.db.exists(doctype, name):
+            frappe.delete_doc(doctype, name, force=True, ignore_permissions=True)
+    frappe.db.commit()
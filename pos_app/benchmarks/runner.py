@@ -0,0 +1,131 @@
+import json
+import time
+
+import frappe
+from frappe.auth import CookieManager
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Response
+
+from pos_app.apis import auth, item, login, sales_invoice
+from pos_app.benchmarks.data import CUSTOMER, PASSWORD, PREFIX, get_bench_users
+
+def run(iterations=50, user=None):
+    """
+    Time the POS endpoints in-process and print p50/p95/p99 latency and the
+    number of DB queries per call. Every call is rolled back, so the seeded
+    data is left unchanged.
+    """
+    usr = user or get_bench_users(1)[0]
+    token = get_token(usr)
+    item_codes = frappe.get_all("Item", filters={"name": ["like", f"{PREFIX}%"]}, limit=5, pluck="name")
+    invoice = {
+        "customer": CUSTOMER,
+        "due_date": frappe.utils.nowdate(),
+        "items": [{"item_code": code, "qty": 1, "rate": 10} for code in item_codes],
+        "payments": [{"mode_of_payment": "Cash", "amount": 10 * len(item_codes)}]
+    }
+
+    def new_invoice(i):
+        return dict(invoice, app_series=f"{PREFIX}-RUN-{i}-{frappe.generate_hash(length=8)}")
+
+    def create_bulk(i):
+        response = call(sales_invoice.create_bulk_sales_invoices, token=token,
+            body={"invoices": [new_invoice(f"{i}-{n}") for n in range(10)]})
+        # The endpoint only stages the batch; create it inline like the background jobs
+        for start in range(0, response["total"], sales_invoice.BULK_CHUNK_SIZE):
+            sales_invoice.process_bulk_invoice_chunk(response["job_id"], start,
+                start + sales_invoice.BULK_CHUNK_SIZE)
+        return response
+
+    cases = {
+        "login_pos_user": lambda i: call(login.login_pos_user, body={
+            "site_url": frappe.utils.get_url(), "usr": usr, "pswd": PASSWORD}),
+        "get_pos_items": lambda i: call(item.get_pos_items, token=token),
+        "create_sales_invoice": lambda i: call(sales_invoice.create_sales_invoice, token=token,
+            body=new_invoice(i)),
+        "create_bulk_sales_invoices": create_bulk,
+        "sales_invoice_history": lambda i: call(sales_invoice.sales_invoice_history, token=token),
+    }
+
+    results = {}
+    for name, case in cases.items():
+        timings, queries = [], []
+        for i in range(iterations):
+            elapsed, query_count = measure(case, i)
+            timings.append(elapsed)
+            queries.append(query_count)
+        results[name] = summarize(timings, queries)
+
+    print_results(results, iterations)
+    return results
+
+def get_token(usr):
+    response = call(login.login_pos_user, body={
+        "site_url": frappe.utils.get_url(), "usr": usr, "pswd": PASSWORD})
+    frappe.db.commit()
+    if response.get("status") != "success":
+        frappe.throw(f"Could not log in as {usr}: {response.get('message')}")
+    return response["token"]
+
+def call(method, token=None, body=None):
+    """Call a whitelisted method as if it came in over HTTP."""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    builder = EnvironBuilder(method="POST", headers=headers,
+        data=json.dumps(body or {}), content_type="application/json")
+    frappe.local.request = builder.get_request()
+    frappe.local.form_dict = frappe._dict()
+    frappe.local.response = frappe._dict()
+    frappe.local.pos_auth = None
+    frappe.local.cookie_manager = CookieManager()
+    frappe.set_user("Guest")
+    try:
+        # What before_request does for a real request
+        auth.validate_auth()
+        result = method()
+    finally:
+        frappe.local.request = None
+    return result
+
+def measure(case, i):
+    db = frappe.db
+    sql = db.sql
+    query_count = 0
+
+    def counting_sql(*args, **kwargs):
+        nonlocal query_count
+        query_count += 1
+        return sql(*args, **kwargs)
+
+    db.sql = counting_sql
+    # Bulk chunks commit per invoice; keep everything in one transaction to roll back
+    db.commit = lambda *args, **kwargs: None
+    start = time.perf_counter()
+    try:
+        result = case(i)
+        if isinstance(result, Response):
+            result.get_data()
+    finally:
+        elapsed = time.perf_counter() - start
+        del db.sql
+        del db.commit
+        frappe.db.rollback()
+    return elapsed * 1000, query_count
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def summarize(timings, queries):
+    return {
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "p99_ms": round(percentile(timings, 99), 2),
+        "queries": round(sum(queries) / len(queries), 1)
+    }
+
+def print_results(results, iterations):
+    print(f"{iterations} iterations per endpoint")
+    print(f"{'endpoint':<30}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>10}")
+    for name, stats in results.items():
+        print(f"{name:<30}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['queries']:>10}")
@@ -4,7 +4,11 @@ app_publisher = "POS"
 app_description = "POS App"
 app_email = "POS_APP@gmail.com"
 app_license = "MIT"
-before_request  = "pos_app.apis.auth.validate_auth"
+before_request  = [
+    "pos_app.apis.stats.start_request",
+    "pos_app.apis.auth.validate_auth"
+]
+after_request = ["pos_app.apis.stats.record_request"]
 
 fixtures = [{
         "doctype": "Custom Field",
@@ -70,7 +74,8 @@ fixtures = [{
 # ------------
 
 # before_install = "pos_app.install.before_install"
-# after_install = "pos_app.install.after_install"
+after_install = "pos_app.install.after_install"
+after_migrate = "pos_app.install.after_migrate"
 
 # Uninstallation
 # ------------
@@ -132,6 +137,87 @@ fixtures = [{
 # 	}
 # }
 
+doc_events = {
+	"Item": {
+		"on_update": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.thumbnail.queue_item_thumbnail",
+			"pos_app.apis.sync_bundle.queue_sync_bundles",
+			"pos_app.apis.barcode.update_barcode_index"
+		],
+		"after_rename": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.barcode.update_barcode_index"
+		],
+		"on_trash": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.sync_bundle.queue_sync_bundles",
+			"pos_app.apis.barcode.update_barcode_index"
+		]
+	},
+	"Item Price": {
+		"on_update": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.price_index.update_price_index",
+			"pos_app.apis.sync_bundle.queue_sync_bundles"
+		],
+		"on_trash": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.sync_bundle.queue_sync_bundles"
+		],
+		"after_delete": "pos_app.apis.price_index.update_price_index"
+	},
+	"Item Group": {
+		"on_update": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.item.clear_catalog_scope",
+			"pos_app.apis.sync_bundle.queue_sync_bundles"
+		],
+		"after_rename": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.item.clear_catalog_scope"
+		],
+		"on_trash": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.item.clear_catalog_scope"
+		]
+	},
+	"POS Profile": {
+		"on_update": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.item.clear_catalog_scope",
+			"pos_app.apis.pos_profile.clear_profile_context",
+			"pos_app.apis.pos_profile.clear_receipt_headers",
+			"pos_app.apis.sync_bundle.queue_sync_bundles"
+		],
+		"after_rename": [
+			"pos_app.apis.item.clear_catalog_scope",
+			"pos_app.apis.pos_profile.clear_profile_context",
+			"pos_app.apis.pos_profile.clear_receipt_headers"
+		],
+		"on_trash": [
+			"pos_app.apis.item.clear_catalog_cache",
+			"pos_app.apis.item.clear_catalog_scope",
+			"pos_app.apis.pos_profile.clear_profile_context",
+			"pos_app.apis.pos_profile.clear_receipt_headers"
+		]
+	},
+	"User Permission": {
+		"on_update": "pos_app.apis.item.clear_catalog_scope",
+		"on_trash": "pos_app.apis.item.clear_catalog_scope"
+	},
+	"Sales Invoice": {
+		"on_submit": [
+			"pos_app.apis.sales_rollup.update_daily_sales",
+			"pos_app.apis.customer.update_mobile_index"
+		],
+		"on_cancel": [
+			"pos_app.apis.sales_rollup.update_daily_sales",
+			"pos_app.apis.customer.update_mobile_index"
+		]
+	}
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -153,6 +239,19 @@ fixtures = [{
 # 	],
 # }
 
+scheduler_events = {
+	"daily": [
+		"pos_app.apis.auth.purge_expired_revocations",
+		"pos_app.apis.sales_invoice.purge_bulk_invoice_jobs",
+		"pos_app.apis.sync_bundle.build_all_sync_bundles"
+	],
+	"cron": {
+		"*/5 * * * *": [
+			"pos_app.apis.sales_capture.consolidate_captured_sales"
+		]
+	}
+}
+
 # Testing
 # -------
 
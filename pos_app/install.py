@@ -0,0 +1,138 @@
+import frappe
+
+def after_install():
+    setup_database()
+
+def after_migrate():
+    setup_database()
+
+def setup_database():
+    create_revocation_table()
+    create_bulk_invoice_tables()
+    create_captured_sale_table()
+    create_daily_sales_table()
+    create_mobile_index_table()
+    create_indexes()
+
+def create_revocation_table():
+    """
+    `blacklisted_jwt_token` keeps only the token hash and its expiry so expired
+    rows can be purged through the `expires_at` index.
+    """
+    frappe.db.sql_ddl("""
+        CREATE TABLE IF NOT EXISTS `blacklisted_jwt_token` (
+            name VARCHAR(40) NOT NULL PRIMARY KEY,
+            expires_at DATETIME(6) NULL,
+            INDEX expires_at (expires_at)
+        )
+    """)
+    frappe.db.sql_ddl("ALTER TABLE `blacklisted_jwt_token` ADD COLUMN IF NOT EXISTS expires_at DATETIME(6) NULL")
+    frappe.db.sql_ddl("ALTER TABLE `blacklisted_jwt_token` DROP COLUMN IF EXISTS token")
+    frappe.db.sql_ddl("CREATE INDEX IF NOT EXISTS expires_at ON `blacklisted_jwt_token` (expires_at)")
+
+    # Rows from before expiry tracking: tokens were issued for 30 days
+    frappe.db.sql("""
+        UPDATE `blacklisted_jwt_token`
+        SET expires_at = UTC_TIMESTAMP() + INTERVAL 30 DAY
+        WHERE expires_at IS NULL
+    """)
+    frappe.db.commit()
+
+def create_bulk_invoice_tables():
+    """Staging tables for `create_bulk_sales_invoices` background jobs."""
+    frappe.db.sql_ddl("""
+        CREATE TABLE IF NOT EXISTS `pos_bulk_invoice_job` (
+            name VARCHAR(40) NOT NULL PRIMARY KEY,
+            user VARCHAR(140) NOT NULL,
+            pos_profile VARCHAR(140) NULL,
+            default_customer VARCHAR(140) NULL,
+            total INT NOT NULL,
+            creation DATETIME(6) NOT NULL,
+            INDEX creation (creation)
+        )
+    """)
+    frappe.db.sql_ddl("""
+        CREATE TABLE IF NOT EXISTS `pos_bulk_invoice_job_item` (
+            job VARCHAR(40) NOT NULL,
+            idx INT NOT NULL,
+            payload LONGTEXT NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            invoice_name VARCHAR(140) NULL,
+            error TEXT NULL,
+            modified DATETIME(6) NOT NULL,
+            PRIMARY KEY (job, idx)
+        )
+    """)
+    frappe.db.sql_ddl("ALTER TABLE `pos_bulk_invoice_job` ADD COLUMN IF NOT EXISTS pos_profile VARCHAR(140) NULL AFTER user")
+
+def create_captured_sale_table():
+    """Append-only staging table for `capture_sales_invoice`."""
+    frappe.db.sql_ddl("""
+        CREATE TABLE IF NOT EXISTS `pos_captured_sale` (
+            name VARCHAR(40) NOT NULL PRIMARY KEY,
+            app_series VARCHAR(140) NULL,
+            pos_profile VARCHAR(140) NULL,
+            user VARCHAR(140) NOT NULL,
+            default_customer VARCHAR(140) NULL,
+            posting_date DATE NOT NULL,
+            payload LONGTEXT NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            claim VARCHAR(40) NULL,
+            invoice_name VARCHAR(140) NULL,
+            error TEXT NULL,
+            creation DATETIME(6) NOT NULL,
+            modified DATETIME(6) NOT NULL,
+            UNIQUE KEY app_series (app_series),
+            INDEX status_creation (status, creation),
+            INDEX claim (claim)
+        )
+    """)
+
+def create_daily_sales_table():
+    """
+    Daily sales per POS Profile and mode of payment, kept up to date from
+    Sales Invoice submit / cancel. Rows with an empty mode_of_payment hold
+    the day's invoice count and grand total.
+    """
+    frappe.db.sql_ddl("""
+        CREATE TABLE IF NOT EXISTS `pos_daily_sales` (
+            posting_date DATE NOT NULL,
+            pos_profile VARCHAR(140) NOT NULL,
+            mode_of_payment VARCHAR(140) NOT NULL,
+            invoice_count INT NOT NULL DEFAULT 0,
+            amount DECIMAL(21, 9) NOT NULL DEFAULT 0,
+            PRIMARY KEY (pos_profile, posting_date, mode_of_payment)
+        )
+    """)
+
+def create_mobile_index_table():
+    """
+    Submitted invoices by digits-only mobile number for the prefix lookup
+    of returning customers; the primary key serves both the prefix range
+    and the latest invoices of a number.
+    """
+    frappe.db.sql_ddl("""
+        CREATE TABLE IF NOT EXISTS `pos_mobile_invoice` (
+            phone VARCHAR(32) NOT NULL,
+            posting_date DATE NOT NULL,
+            invoice VARCHAR(140) NOT NULL,
+            customer VARCHAR(140) NULL,
+            owner VARCHAR(140) NOT NULL,
+            grand_total DECIMAL(21, 9) NOT NULL DEFAULT 0,
+            PRIMARY KEY (phone, posting_date, invoice),
+            INDEX invoice (invoice)
+        )
+    """)
+
+def create_indexes():
+    """
+    Composite indexes for the POS read paths: invoice history of the app's
+    invoices of a profile, in keyset order, and price lookups per price list.
+    app_series already has the unique index of its custom field.
+    """
+    if frappe.db.has_column("Sales Invoice", "is_sent_from_mobile"):
+        # Replaced by the profile index: owner IN (...) could not be read in order
+        frappe.db.sql_ddl("DROP INDEX IF EXISTS pos_history_index ON `tabSales Invoice`")
+        frappe.db.add_index("Sales Invoice",
+            ["is_sent_from_mobile", "pos_profile", "posting_date", "name"], "pos_profile_history_index")
+    frappe.db.add_index("Item Price", ["price_list", "item_code"], "pos_price_list_item_index")
@@ -0,0 +1,33 @@
+import frappe
+
+def execute():
+    """
+    app_series becomes unique with the fixtures, which Frappe refuses while
+    duplicates exist. Keep the value on one invoice per series (submitted
+    first, then the oldest) and suffix the others with their own name.
+    """
+    if not frappe.db.has_column("Sales Invoice", "app_series"):
+        return
+
+    frappe.db.sql("UPDATE `tabSales Invoice` SET app_series = NULL WHERE app_series = ''")
+
+    duplicates = frappe.db.sql("""
+        SELECT si.name, si.app_series
+        FROM `tabSales Invoice` si
+        INNER JOIN (
+            SELECT app_series FROM `tabSales Invoice`
+            WHERE app_series IS NOT NULL
+            GROUP BY app_series
+            HAVING COUNT(*) > 1
+        ) dup ON dup.app_series = si.app_series
+        ORDER BY si.app_series, si.docstatus = 1 DESC, si.docstatus = 2, si.creation, si.name
+    """, as_dict=True)
+
+    kept = set()
+    for row in duplicates:
+        if row.app_series not in kept:
+            kept.add(row.app_series)
+            continue
+        frappe.db.sql("""
+            UPDATE `tabSales Invoice` SET app_series = CONCAT(app_series, '-', name) WHERE name = %s
+        """, (row.name,))
@@ -0,0 +1,22 @@
+import frappe
+
+def execute():
+    """
+    Invoices created through the app before is_sent_from_mobile and
+    pos_profile were set carry an app_series; mark them so the profile
+    scoped history still shows them.
+    """
+    if not frappe.db.has_column("Sales Invoice", "is_sent_from_mobile"):
+        return
+
+    frappe.db.sql("""
+        UPDATE `tabSales Invoice`
+        SET is_sent_from_mobile = 1
+        WHERE IFNULL(app_series, '') != '' AND is_sent_from_mobile = 0
+    """)
+    frappe.db.sql("""
+        UPDATE `tabSales Invoice` si
+        SET si.pos_profile = (
+            SELECT pu.parent FROM `tabPOS Profile User` pu WHERE pu.user = si.owner LIMIT 1)
+        WHERE si.is_sent_from_mobile = 1 AND IFNULL(si.pos_profile, '') = ''
+    """)
@@ -1,8 +1,10 @@
 import frappe
 from frappe.model.document import Document
 from frappe.installer import update_site_config
+from pos_app.apis.welcome_page import clear_app_settings_cache
 
 class POSAppSettings(Document):
     def on_update(self):
+        clear_app_settings_cache()
         if self.pos_password:
             update_site_config("pos_app_password", self.pos_password)
\ No newline at end of file